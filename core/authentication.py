@@ -0,0 +1,99 @@
+"""
+Stateless JWT authentication.
+
+Access tokens carry the user's username, `is_superuser`, `is_staff` and
+group names, so `StatelessJWTAuthentication` can build the request user
+from the token without loading the `users` row. The only per-request
+lookup is the user's token version in the cache: changing the user or
+their groups bumps it, tokens issued before that are rejected, and the
+client gets a token with the new claims from the refresh endpoint.
+
+Enable with AUTH_STATELESS_JWT=true; the token serializers add the
+claims either way, so switching does not require logging in again.
+"""
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .cache import bump_generation, get_generations
+from .models import User
+from .roles import get_roles
+
+ROLES_CLAIM = 'roles'
+VERSION_CLAIM = 'ver'
+TOKEN_VERSION_NAMESPACE = "token_version_{}"
+
+
+def get_token_version(user_id):
+    return get_generations([TOKEN_VERSION_NAMESPACE.format(user_id)])[0]
+
+
+def revoke_tokens(*user_ids):
+    """
+    Reject every token issued to `user_ids` so far; runs on commit.
+    """
+    bump_generation(*(TOKEN_VERSION_NAMESPACE.format(user_id) for user_id in user_ids))
+
+
+def add_user_claims(token, user):
+    token['username'] = user.username
+    token['is_superuser'] = user.is_superuser
+    token['is_staff'] = user.is_staff
+    token[ROLES_CLAIM] = sorted(get_roles(user))
+    token[VERSION_CLAIM] = get_token_version(user.pk)
+    return token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        try:
+            data = super().validate(attrs)
+            # claim di refresh token bisa sudah basi: isi ulang dari database
+            access = AccessToken(data['access'])
+            user = User.objects.get(pk=access[api_settings.USER_ID_CLAIM])
+        except User.DoesNotExist:
+            # user dihapus setelah refresh token diterbitkan
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        data['access'] = str(add_user_claims(access, user))
+        return data
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Request user built from token claims. Roles are pre-filled for
+    `core.roles`, so permission checks need no query either.
+    """
+    def __init__(self, token):
+        super().__init__(token)
+        self._role_names = frozenset(token.get(ROLES_CLAIM, ()))
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def id(self):
+        # UUID, sama seperti User.pk, supaya perbandingan pk tetap cocok
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if ROLES_CLAIM not in validated_token:
+            # token lama tanpa claim role: pakai lookup database biasa
+            return super().get_user(validated_token)
+
+        user = RoleTokenUser(validated_token)
+        if validated_token.get(VERSION_CLAIM) != get_token_version(user.pk):
+            raise InvalidToken(_("Token has been revoked, refresh it to continue."))
+        return user
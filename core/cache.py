@@ -0,0 +1,136 @@
+"""
+Generation-based cache keys.
+
+Every cached entry is keyed by the current generation of the models its
+data comes from. A write bumps the generation counter of that model, so
+all entries built on the old generation are never read again and simply
+expire through their TTL. No key scanning or explicit deletes needed.
+
+Entries hold the final rendered JSON body plus its hash, so a cache hit
+is sent without parsing or re-encoding, and answered with 304 when the
+client's If-None-Match still matches.
+"""
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+GENERATION_KEY = "generation_{}"
+
+# namespace -> namespaces whose data ends up in its cached entries.
+# Deleting an event cascades down this chain, so a bump on 'events'
+# also makes every cached ticket, registration and payment stale.
+DEPENDENCIES = {
+    'events': ('events',),
+    'event_posters': ('event_posters', 'events'),
+    'tickets': ('tickets', 'events'),
+    'registrations': ('registrations', 'tickets', 'events', 'users'),
+    'payments': ('payments', 'registrations', 'tickets', 'events'),
+}
+
+
+def _seed():
+    # Counter yang hilang (evicted) di-seed ulang dengan timestamp supaya
+    # tidak pernah kembali ke generation lama yang mungkin masih tersimpan.
+    return time.time_ns()
+
+
+def get_generations(namespaces):
+    keys = [GENERATION_KEY.format(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        seed = _seed()
+        for key in missing:
+            cache.add(key, seed, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def make_key(namespace, key):
+    """
+    Return `key` suffixed with the generations `namespace` depends on.
+    """
+    generations = get_generations(DEPENDENCIES.get(namespace, (namespace,)))
+    return f"{key}:g{'.'.join(str(generation) for generation in generations)}"
+
+
+def _incr(namespaces):
+    for namespace in namespaces:
+        key = GENERATION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _seed(), timeout=None)
+
+
+class _PendingBump:
+    def __init__(self, hooks):
+        self.namespaces = set()
+        # list on_commit connection saat didaftarkan; Django menggantinya dengan
+        # list baru setiap commit, rollback dan rollback savepoint
+        self.hooks = hooks
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        _incr(self.namespaces)
+
+
+def bump_generation(*namespaces):
+    """
+    Invalidate every cached entry that depends on `namespaces`.
+
+    Inside a transaction the bump runs once on commit, no matter how many
+    rows were written (a cascading delete sends one signal per row): the
+    callback is registered once and later bumps only add namespaces to it.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _incr(namespaces)
+        return
+
+    pending = getattr(connection, '_pending_generation_bump', None)
+    # Callback lama bisa sudah jalan, atau dibuang oleh rollback: daftarkan
+    # yang baru. Setelah rollback savepoint callback lama di luar savepoint
+    # itu tetap jalan juga, itu hanya invalidasi berlebih.
+    if pending is None or pending.done or pending.hooks is not connection.run_on_commit:
+        pending = _PendingBump(connection.run_on_commit)
+        connection._pending_generation_bump = pending
+        transaction.on_commit(pending)
+    pending.namespaces.update(namespaces)
+
+
+def render_entry(data, **extra):
+    """
+    Render `data` once into the final JSON body and hash it for the ETag.
+    Extra values (e.g. the owner used for access checks) are stored as-is.
+    """
+    body = JSONRenderer().render(data)
+    etag = '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest())
+    return {'body': body, 'etag': etag, **extra}
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    # weak comparison (RFC 9110): W/"x" cocok dengan "x"
+    etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+    return '*' in etags or etag in etags
+
+
+def entry_response(request, entry, data_source):
+    """
+    Send a rendered entry as-is, or 304 if the client already has it.
+    """
+    if _etag_matches(request, entry['etag']):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    response['X-Data-Source'] = data_source
+    return response
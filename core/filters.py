@@ -0,0 +1,54 @@
+import uuid
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Greatest
+from rest_framework.exceptions import ValidationError
+
+
+def parse_uuid_param(name, value):
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise ValidationError({name: "Invalid UUID."})
+
+
+def apply_filters(queryset, params, filters):
+    """
+    Filter `queryset` by the query params present in `params`.
+
+    `filters` is a sequence of (query param, lookup, parser); `parser` turns
+    the raw value into a lookup value or raises ValidationError, None keeps
+    the string as-is.
+    """
+    for param, lookup, parser in filters:
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: parser(param, value) if parser else value})
+    return queryset
+
+
+USER_FILTERS = (
+    # join users_groups -> auth_group di query yang sama, tanpa subquery
+    ('group', 'groups__name', None),
+)
+
+
+def filter_users(queryset, params):
+    return apply_filters(queryset, params, USER_FILTERS)
+
+
+def search_users(queryset, term):
+    """
+    Prefix match on `username`/`email` (UPPER() text_pattern_ops indexes)
+    OR trigram word similarity (GIN gin_trgm_ops) for typos, annotated
+    with a `rank` that puts prefix matches first.
+    """
+    prefix = Q(username__istartswith=term) | Q(email__istartswith=term)
+    return queryset.annotate(
+        # cast ke double supaya nilai rank di cursor bisa dibandingkan persis
+        rank=Cast(
+            Case(When(prefix, then=Value(1.0)), default=Value(0.0))
+            + Greatest(TrigramWordSimilarity(term, 'username'), TrigramWordSimilarity(term, 'email')),
+            FloatField()
+        )
+    ).filter(prefix | Q(username__trigram_word_similar=term) | Q(email__trigram_word_similar=term))
@@ -0,0 +1,103 @@
+"""
+`Idempotency-Key` support for POST handlers.
+
+The first request with a key runs the view and stores its response in the
+cache. Retries with the same key get the stored response back without
+running the view again. A duplicate that arrives while the first request
+is still running waits for that result instead of running concurrently;
+`cache.add` is the in-flight lock because it only succeeds for one caller.
+
+Keys are scoped to the user and endpoint, and bound to a hash of the
+request body: reusing a key for a different payload is rejected.
+"""
+import hashlib
+import time
+from functools import wraps
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from dico_event.logging_config import logger
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+CACHE_KEY_RESULT = "idempotency_result_{}"
+CACHE_KEY_LOCK = "idempotency_lock_{}"
+RESULT_TIMEOUT = 24 * 60 * 60
+# lock habis sendiri kalau worker mati di tengah request
+LOCK_TIMEOUT = 60
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def _replay(entry, fingerprint):
+    if entry['fingerprint'] != fingerprint:
+        return Response(
+            {'error': f'{IDEMPOTENCY_HEADER} was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    response = HttpResponse(entry['body'], status=entry['status'], content_type='application/json')
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """
+    Decorator for APIView handlers; requests without the header run as usual.
+    """
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(self, request, *args, **kwargs)
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        scope = f"{request.user.pk}:{request.method}:{request.path}:{key}"
+        digest = hashlib.sha256(scope.encode()).hexdigest()
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        result_key = CACHE_KEY_RESULT.format(digest)
+        lock_key = CACHE_KEY_LOCK.format(digest)
+
+        entry = cache.get(result_key)
+        if entry is not None:
+            logger.info(f"Replaying idempotent response for {request.path} to {request.user}")
+            return _replay(entry, fingerprint)
+
+        if cache.add(lock_key, fingerprint, timeout=LOCK_TIMEOUT):
+            try:
+                response = handler(self, request, *args, **kwargs)
+                # error server tidak disimpan supaya retry bisa mencoba lagi
+                if response.status_code < 500 and isinstance(response, Response):
+                    cache.set(result_key, {
+                        'status': response.status_code,
+                        'body': JSONRenderer().render(response.data),
+                        'fingerprint': fingerprint,
+                    }, timeout=RESULT_TIMEOUT)
+            finally:
+                cache.delete(lock_key)
+            return response
+
+        # request yang sama sedang diproses: tunggu hasilnya
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(result_key)
+            if entry is not None:
+                return _replay(entry, fingerprint)
+            if cache.get(lock_key) is None:
+                # request pertama gagal tanpa hasil tersimpan
+                break
+
+        logger.warning(f"Idempotent request for {request.path} by {request.user} still in progress")
+        return Response(
+            {'error': f'A request with this {IDEMPOTENCY_HEADER} is still in progress.'},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    return wrapper
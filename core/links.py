@@ -0,0 +1,114 @@
+"""
+Hypermedia `_links` for serializers.
+
+Each route's URL is resolved with reverse() once per process and split
+around the pk, so building links for an object is plain string joining.
+The scheme/host prefix is computed once per request and shared by every
+object in a list response. Clients can send `?links=false` to drop the
+field entirely.
+
+Links are absolute, so cached responses that embed them must be keyed by
+scheme and host as well; see `cache_variant`.
+"""
+import hashlib
+import uuid
+from functools import lru_cache
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+
+# contoh pk untuk resolve template; harus cocok dengan converter <uuid:pk> / <int:pk>
+SAMPLE_PKS = (uuid.UUID('5a3d1c7e-9b2f-4e61-8c0d-7f4a2b9e6d13'), 918273645)
+
+
+@lru_cache(maxsize=None)
+def _list_url(route, script_prefix):
+    return reverse(route)
+
+
+@lru_cache(maxsize=None)
+def _detail_template(route, script_prefix):
+    for sample in SAMPLE_PKS:
+        try:
+            url = reverse(route, kwargs={'pk': sample})
+        except NoReverseMatch:
+            continue
+        prefix, suffix = url.split(str(sample))
+        return prefix, suffix
+    raise NoReverseMatch(f"Route '{route}' has no <pk> argument.")
+
+
+def links_enabled(request):
+    if request is None:
+        return True
+    params = getattr(request, 'query_params', request.GET)
+    return params.get('links', '').lower() not in ('false', '0', 'no')
+
+
+def cache_variant(request):
+    """
+    Suffix for cache keys of responses whose shape depends on `?links=`.
+    With links on, the scheme/host is part of the key so one host's links
+    are never served to a request that came in through another host.
+    """
+    if not links_enabled(request):
+        return ':nolinks'
+    return ':' + hashlib.md5(request.build_absolute_uri('/').encode()).hexdigest()[:12]
+
+
+class HypermediaLinksMixin:
+    """
+    Serializer mixin implementing `get__links` for a `_links` method field.
+
+    `link_routes` is the (list route, detail route) pair; `link_rels` sets
+    the rel for the POST, GET, PUT and DELETE links respectively.
+    """
+    link_routes = None
+    link_rels = ('self', 'self', 'self', 'self')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not links_enabled(self.context.get('request')):
+            fields.pop('_links', None)
+        return fields
+
+    def _link_base(self):
+        # context dibagi oleh semua child serializer (many=True), jadi cukup sekali per request
+        context = self.context
+        if '_link_base' not in context:
+            request = context.get('request')
+            context['_link_base'] = request.build_absolute_uri('/')[:-1] if request else ''
+        return context['_link_base']
+
+    def get__links(self, obj):
+        list_route, detail_route = self.link_routes
+        script_prefix = get_script_prefix()
+        base = self._link_base()
+        prefix, suffix = _detail_template(detail_route, script_prefix)
+        list_href = base + _list_url(list_route, script_prefix)
+        detail_href = f"{base}{prefix}{obj.pk}{suffix}"
+        post_rel, get_rel, put_rel, delete_rel = self.link_rels
+        return [
+            {
+                "rel": post_rel,
+                "href": list_href,
+                "action": "POST",
+                "types": ["application/json"]
+            },
+            {
+                "rel": get_rel,
+                "href": detail_href,
+                "action": "GET",
+                "types": ["application/json"]
+            },
+            {
+                "rel": put_rel,
+                "href": detail_href,
+                "action": "PUT",
+                "types": ["application/json"]
+            },
+            {
+                "rel": delete_rel,
+                "href": detail_href,
+                "action": "DELETE",
+                "types": ["application/json"]
+            },
+        ]
@@ -0,0 +1,17 @@
+class RateLimitHeadersMiddleware:
+    """
+    Add RateLimit-* headers (IETF draft) from the bucket that
+    `core.throttling` found most restrictive for the request.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            response['RateLimit-Limit'] = rate_limit['limit']
+            response['RateLimit-Remaining'] = rate_limit['remaining']
+            response['RateLimit-Reset'] = rate_limit['reset']
+            response['RateLimit-Policy'] = f"{rate_limit['limit']};w={rate_limit['window']}"
+        return response
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 import uuid
 
 # Create your models here.
@@ -11,4 +13,11 @@ class User(AbstractUser):
         return self.username
 
     class Meta:
-        db_table = 'users'
\ No newline at end of file
+        db_table = 'users'
+        indexes = [
+            # istartswith di PostgreSQL = UPPER(kolom) LIKE UPPER('term%')
+            models.Index(OpClass(Upper('username'), name='text_pattern_ops'), name='users_username_prefix_idx'),
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='users_email_prefix_idx'),
+            GinIndex(fields=['username'], opclasses=['gin_trgm_ops'], name='users_username_trgm_idx'),
+            GinIndex(fields=['email'], opclasses=['gin_trgm_ops'], name='users_email_trgm_idx'),
+        ]
@@ -0,0 +1,20 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination. The next page is fetched with
+    `WHERE <sort key> > <last position>` on an indexed column instead of
+    OFFSET, so deep pages cost the same as the first one.
+
+    Subclasses set `ordering` to a unique (or unique-suffixed) index.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_links(self):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
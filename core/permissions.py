@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from .roles import has_role
 
 class IsSuperUser(BasePermission):
     def has_permission(self, request, view):
@@ -8,25 +9,25 @@ class IsSuperUser(BasePermission):
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated and \
-            request.user.groups.filter(name='admin').exists()
+            has_role(request.user, 'admin')
 
 class IsOrganizer(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated \
-            and request.user.groups.filter(name='organizer').exists()
+            and has_role(request.user, 'organizer')
 
 class IsAdminOrSuperUser(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated and (
             request.user.is_superuser or
-            request.user.groups.filter(name='admin').exists()
+            has_role(request.user, 'admin')
         )
 
 class IsOwnerOrAdminOrSuperUser(BasePermission):
     """
     Superuser, staff (is_staff=True), atau user dalam group 'admin'
     bebas akses.
-    Organizer hanya boleh jika event adalah miliknya (obj.organizer_id == user).
+    Organizer hanya boleh jika event adalah miliknya (obj.organizer_id_id == user.pk).
     """
     
     def has_permission(self, request, view):
@@ -39,11 +40,11 @@ class IsOwnerOrAdminOrSuperUser(BasePermission):
             return False
 
         # superuser & admin group full access
-        if user.is_superuser or user.is_staff or user.groups.filter(name="admin").exists():
+        if user.is_superuser or user.is_staff or has_role(user, 'admin'):
             return True
 
         # cek kepemilikan event (organizer)
-        if hasattr(obj, "organizer_id"):
-            return obj.organizer_id == user
+        if hasattr(obj, "organizer_id_id"):
+            return obj.organizer_id_id == user.pk
         
         return False
\ No newline at end of file
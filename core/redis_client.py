@@ -0,0 +1,20 @@
+from functools import lru_cache
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_redis():
+    """
+    Raw client for Redis data structures the Django cache API does not
+    cover (sorted sets, Lua scripts). Uses the same server as the cache.
+    """
+    return redis.Redis.from_url(settings.CACHES['default']['LOCATION'], decode_responses=True)
+
+
+@lru_cache(maxsize=None)
+def get_script(source):
+    """
+    Lua script registered once per source; calls go through EVALSHA.
+    """
+    return get_redis().register_script(source)
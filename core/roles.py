@@ -0,0 +1,50 @@
+"""
+Role (group name) lookup for permission checks.
+
+A user's group names are loaded once and kept in two places: on the user
+object for the rest of the request, like Django's own `_perm_cache`, and
+in the cache under the 'roles' generation for later requests. Changing a
+user's groups drops that user's entry; renaming or deleting a group, or
+changing its members from the group side, bumps the generation.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from .cache import bump_generation, make_key
+
+CACHE_KEY_ROLES = "user_roles_{}"
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+
+def get_roles(user):
+    """
+    Group names of `user` as a frozenset; empty for anonymous users.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, '_role_names', None)
+    if roles is None:
+        cache_key = make_key('roles', CACHE_KEY_ROLES.format(user.pk))
+        names = cache.get(cache_key)
+        if names is None:
+            names = list(user.groups.values_list('name', flat=True))
+            cache.set(cache_key, names, timeout=ROLE_CACHE_TIMEOUT)
+        roles = user._role_names = frozenset(names)
+    return roles
+
+
+def has_role(user, *names):
+    return not get_roles(user).isdisjoint(names)
+
+
+def invalidate_roles(user):
+    """
+    Forget the cached roles of `user` once the current transaction commits.
+    """
+    user.__dict__.pop('_role_names', None)
+    user_id = user.pk
+    # dihapus setelah commit supaya request lain tidak meng-cache ulang role lama
+    transaction.on_commit(lambda: cache.delete(make_key('roles', CACHE_KEY_ROLES.format(user_id))))
+
+
+def invalidate_all_roles():
+    bump_generation('roles')
@@ -1,10 +1,14 @@
 from rest_framework import serializers
-from rest_framework.reverse import reverse
+from core.links import HypermediaLinksMixin
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group
 from core.models import User
 
-class UserSerializer(serializers.HyperlinkedModelSerializer):
+BULK_ROLE_ASSIGNMENT_MAX_SIZE = 5000
+BULK_USER_MAX_SIZE = 1000
+
+class UserSerializer(HypermediaLinksMixin, serializers.HyperlinkedModelSerializer):
+    link_routes = ('user-list', 'user-detail')
     _links = serializers.SerializerMethodField()
 
     class Meta:
@@ -22,71 +26,27 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
         validated_data['password'] = make_password(password)
         return User.objects.create(**validated_data)
 
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('user-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('user-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('user-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('user-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            }
-        ]
-
-class GroupSerializer(serializers.HyperlinkedModelSerializer):
+class GroupSerializer(HypermediaLinksMixin, serializers.HyperlinkedModelSerializer):
+    link_routes = ('group-list', 'group-detail')
     _links = serializers.SerializerMethodField()
 
     class Meta:
         model = Group
         fields = ['id', 'name', '_links']
 
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('group-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('group-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('group-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('group-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            }
-        ]
-
 class AssignRoleSerializer(serializers.Serializer):
     user_id = serializers.UUIDField()
-    group_id = serializers.IntegerField()
\ No newline at end of file
+    group_id = serializers.IntegerField()
+
+class BulkAssignRoleSerializer(serializers.Serializer):
+    assignments = AssignRoleSerializer(many=True, allow_empty=False, max_length=BULK_ROLE_ASSIGNMENT_MAX_SIZE)
+
+class BulkUserItemSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=300)
+    email = serializers.EmailField(required=False, allow_blank=True, default='')
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    password = serializers.CharField(write_only=True)
+
+class BulkUserSerializer(serializers.Serializer):
+    users = BulkUserItemSerializer(many=True, allow_empty=False, max_length=BULK_USER_MAX_SIZE)
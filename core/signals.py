@@ -0,0 +1,76 @@
+from django.contrib.auth.models import Group
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete, pre_migrate
+from django.dispatch import receiver
+from .authentication import revoke_tokens
+from .cache import bump_generation
+from .models import User
+from .roles import invalidate_all_roles, invalidate_roles
+
+
+def deleted_with(origin, *models):
+    """
+    True when the delete() that sent a pre/post_delete signal started at
+    one of `models`, i.e. the row goes away in that model's cascade.
+    """
+    # origin: instance atau queryset yang di-delete()
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(origin_model, models)
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='users_bump_generation')
+def bump_user_generation(sender, **kwargs):
+    bump_generation('users')
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='users_groups_invalidate_roles')
+def invalidate_user_roles(sender, instance, action, reverse, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # perubahan dari sisi group (group.user_set): user yang terdampak bisa banyak
+        invalidate_all_roles()
+    else:
+        invalidate_roles(instance)
+
+
+@receiver([post_save, post_delete], sender=Group, dispatch_uid='groups_invalidate_roles')
+def invalidate_group_roles(sender, **kwargs):
+    # nama group dipakai sebagai role
+    invalidate_all_roles()
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='users_revoke_tokens')
+def revoke_user_tokens(sender, instance, created=False, **kwargs):
+    # username, flag superuser/staff, password, atau status aktif bisa berubah
+    if not created:
+        revoke_tokens(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='users_groups_revoke_tokens')
+def revoke_member_tokens(sender, instance, action, reverse, pk_set, **kwargs):
+    # token menyimpan nama group sebagai claim role
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            revoke_tokens(instance.pk)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        revoke_tokens(*pk_set)
+    elif action == 'pre_clear':
+        revoke_tokens(*instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group, dispatch_uid='groups_revoke_tokens')
+@receiver(pre_delete, sender=Group, dispatch_uid='groups_revoke_tokens_delete')
+def revoke_group_member_tokens(sender, instance, created=False, **kwargs):
+    if not created:
+        revoke_tokens(*instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_migrate, dispatch_uid='core_create_postgres_extensions')
+def create_postgres_extensions(sender, using, **kwargs):
+    # index gin_trgm_ops butuh pg_trgm sebelum migration membuat index-nya
+    connection = connections[using]
+    if sender.name != 'core' or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
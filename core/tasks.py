@@ -0,0 +1,135 @@
+"""
+Background user provisioning.
+
+Password hashing is deliberately slow, so a bulk request only validates
+the batch and splits it into chunks; each chunk is a Celery task, and
+the prefork worker pool hashes several chunks in parallel. Progress is
+kept in cache counters that every chunk increments.
+
+Plain passwords never go through the broker. Each chunk's passwords sit
+in Redis under a one-time key with a short TTL, and the worker takes
+them with GETDEL, so a redelivered or retried task finds nothing and
+the chunk is counted as failed.
+"""
+import json
+import uuid
+from celery import group, shared_task
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from .cache import bump_generation
+from .models import User
+from .redis_client import get_redis
+from dico_event.logging_config import logger
+
+CACHE_KEY_PROVISIONING = "user_provisioning_{}"
+CACHE_KEY_PROVISIONING_COUNTER = "user_provisioning_{}_{}"
+PROVISIONING_COUNTERS = ('processed', 'created', 'failed')
+PROVISIONING_CHUNK_SIZE = 50
+PROVISIONING_JOB_TIMEOUT = 24 * 60 * 60
+KEY_PROVISIONING_PASSWORDS = "user_provisioning:{}:{}:passwords"
+# chunk yang belum diambil worker selama ini gagal, password-nya tidak disimpan lebih lama
+PROVISIONING_PASSWORD_TIMEOUT = 60 * 60
+
+
+def _count(job_id, counter, amount):
+    try:
+        cache.incr(CACHE_KEY_PROVISIONING_COUNTER.format(job_id, counter), amount)
+    except ValueError:
+        # status job sudah expired; user tetap dibuat
+        pass
+
+
+def start_provisioning(users, requested_by):
+    """
+    Queue `users` (validated BulkUserItemSerializer data) and return the
+    job id for `provisioning_status`.
+    """
+    job_id = str(uuid.uuid4())
+    cache.set(
+        CACHE_KEY_PROVISIONING.format(job_id),
+        {'total': len(users), 'requested_by': str(requested_by)},
+        timeout=PROVISIONING_JOB_TIMEOUT
+    )
+    cache.set_many(
+        {CACHE_KEY_PROVISIONING_COUNTER.format(job_id, counter): 0 for counter in PROVISIONING_COUNTERS},
+        timeout=PROVISIONING_JOB_TIMEOUT
+    )
+
+    chunks = [users[start:start + PROVISIONING_CHUNK_SIZE] for start in range(0, len(users), PROVISIONING_CHUNK_SIZE)]
+    pipe = get_redis().pipeline()
+    for index, chunk in enumerate(chunks):
+        pipe.set(
+            KEY_PROVISIONING_PASSWORDS.format(job_id, index),
+            json.dumps({user['username']: user['password'] for user in chunk}),
+            ex=PROVISIONING_PASSWORD_TIMEOUT
+        )
+    pipe.execute()
+
+    group(
+        provision_users.s(job_id, index, [
+            {field: value for field, value in user.items() if field != 'password'} for user in chunk
+        ])
+        for index, chunk in enumerate(chunks)
+    ).delay()
+    return job_id
+
+
+def provisioning_status(job_id):
+    job = cache.get(CACHE_KEY_PROVISIONING.format(job_id))
+    if job is None:
+        return None
+    counters = cache.get_many([
+        CACHE_KEY_PROVISIONING_COUNTER.format(job_id, counter) for counter in PROVISIONING_COUNTERS
+    ])
+    status = {
+        counter: counters.get(CACHE_KEY_PROVISIONING_COUNTER.format(job_id, counter), 0)
+        for counter in PROVISIONING_COUNTERS
+    }
+    finished = status['processed'] + status['failed']
+    return {
+        'job_id': job_id,
+        'requested_by': job['requested_by'],
+        'total': job['total'],
+        **status,
+        # username yang sudah terpakai saat chunk diproses dilewati
+        'skipped': status['processed'] - status['created'],
+        'status': 'done' if finished >= job['total'] else 'running',
+    }
+
+
+@shared_task
+def provision_users(job_id, chunk, users):
+    """
+    Hash and insert one chunk with a single bulk_create.
+    """
+    passwords = get_redis().getdel(KEY_PROVISIONING_PASSWORDS.format(job_id, chunk))
+    if passwords is None:
+        # sudah diambil (task dikirim ulang) atau expired
+        _count(job_id, 'failed', len(users))
+        logger.error(f"User provisioning job {job_id}: passwords of chunk {chunk} are gone, {len(users)} users not created")
+        return f'0 of {len(users)} users created'
+    passwords = json.loads(passwords)
+
+    try:
+        accounts = [
+            User(
+                username=user['username'],
+                email=user['email'],
+                first_name=user['first_name'],
+                last_name=user['last_name'],
+                password=make_password(passwords[user['username']])
+            )
+            for user in users
+        ]
+        User.objects.bulk_create(accounts, ignore_conflicts=True)
+        created = User.objects.filter(pk__in=[account.pk for account in accounts]).count()
+    except Exception as e:
+        _count(job_id, 'failed', len(users))
+        logger.error(f"User provisioning job {job_id}: chunk {chunk} of {len(users)} failed: {str(e)}")
+        raise
+
+    # bulk_create tidak mengirim post_save
+    bump_generation('users')
+    _count(job_id, 'created', created)
+    _count(job_id, 'processed', len(users))
+    return f'{created} of {len(users)} users created'
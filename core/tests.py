@@ -1,3 +1,36 @@
+from django.db import transaction
 from django.test import TestCase
+from .cache import bump_generation, get_generations
 
-# Create your tests here.
+
+class BumpGenerationTests(TestCase):
+    def generation(self):
+        return get_generations(['events'])[0]
+
+    def test_bumps_in_one_transaction_share_one_callback(self):
+        before = self.generation()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for _ in range(100):
+                bump_generation('events')
+            bump_generation('tickets')
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.generation(), before + 1)
+
+    def test_bump_after_savepoint_rollback_still_runs(self):
+        before = self.generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    bump_generation('events')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            bump_generation('events')
+        self.assertEqual(self.generation(), before + 1)
+
+    def test_bump_after_previous_callback_ran(self):
+        before = self.generation()
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                bump_generation('events')
+        self.assertEqual(self.generation(), before + 2)
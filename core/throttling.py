@@ -0,0 +1,142 @@
+"""
+Token bucket throttles shared by every app node.
+
+Each bucket is a Redis hash {tokens, ts} updated by one Lua call, so
+concurrent requests on different nodes can never spend the same token.
+A bucket holds up to N tokens for a rate of "N/period" and refills
+continuously, which allows short bursts while keeping the average rate.
+
+    throttle:user:<user id>          every request of a user
+    throttle:ip:<ip>                 every request from an address
+    throttle:<scope>:<user id|ip>    writes to endpoints with `throttle_scope`
+
+Addresses come from REMOTE_ADDR, or from X-Forwarded-For as set by the
+REST_FRAMEWORK['NUM_PROXIES'] trusted proxies in front of the app.
+
+Rates live in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. The most
+restrictive bucket of a request is reported in RateLimit-* headers by
+`core.middleware.RateLimitHeadersMiddleware`.
+"""
+import math
+import time
+from redis import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+from .redis_client import get_script
+from dico_event.logging_config import logger
+
+# KEYS[1] = bucket; ARGV = kapasitas, token per ms, sekarang (ms)
+# return {diizinkan, sisa token, tunggu sampai 1 token (ms), sampai penuh lagi (ms)}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+local reset = math.ceil((capacity - tokens) / rate)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+-- bucket yang sudah penuh lagi tidak perlu disimpan
+redis.call('PEXPIRE', KEYS[1], reset + 1000)
+return {allowed, math.floor(tokens), wait, reset}
+"""
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with the history list replaced by a token bucket.
+    Subclasses pick the bucket through `get_cache_key`; None skips it.
+    """
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        try:
+            allowed, remaining, wait, reset = get_script(TOKEN_BUCKET_SCRIPT)(
+                keys=[key],
+                args=[self.num_requests, self.num_requests / (self.duration * 1000), int(time.time() * 1000)]
+            )
+        except RedisError as e:
+            # Redis mati: lebih baik tanpa throttle daripada menolak semua request
+            logger.warning(f"Throttle {self.scope} skipped: {str(e)}")
+            return True
+
+        self.wait_ms = wait
+        self.report(request, remaining, reset)
+        if not allowed:
+            logger.warning(f"Request to {request.path} throttled on {key}")
+        return bool(allowed)
+
+    def wait(self):
+        return self.wait_ms / 1000
+
+    def report(self, request, remaining, reset):
+        """
+        Keep the bucket with the fewest tokens left for the response headers.
+        """
+        current = getattr(request._request, 'rate_limit', None)
+        if current is None or remaining < current['remaining']:
+            request._request.rate_limit = {
+                'limit': self.num_requests,
+                'remaining': remaining,
+                'reset': math.ceil(reset / 1000),
+                'window': self.duration,
+            }
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        # anonymous dibatasi lewat IPBucketThrottle
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    scope = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class ScopedBucketThrottle(TokenBucketThrottle):
+    """
+    Per-endpoint budget for writes to views with a `throttle_scope`, per
+    user or, for anonymous clients, per address. Reads only go through
+    the user and IP buckets.
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # rate baru diketahui dari view, di allow_request
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope or request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
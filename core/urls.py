@@ -1,14 +1,17 @@
 from django.urls import path
 from . import views
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path('users/', views.UserListCreateView.as_view(), name='user-list'),
+    path('users/bulk/', views.UserBulkCreateView.as_view(), name='user-bulk'),
+    path('users/bulk/<uuid:job_id>/', views.UserBulkStatusView.as_view(), name='user-bulk-status'),
     path('users/<uuid:pk>/', views.UserDetailView.as_view(), name='user-detail'),
     path('groups/', views.GroupListCreateView.as_view(), name='group-list'),
     path('groups/<int:pk>/', views.GroupDetailView.as_view(), name='group-detail'),
-    path('login/', TokenObtainPairView.as_view(), name='token-obtain-pair'),
+    path('login/', views.LoginView.as_view(), name='token-obtain-pair'),
     path('token/', TokenRefreshView.as_view(), name='token-obtain-pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path('assign-roles/', views.AssignRoleView.as_view(), name='assign-roles'),
+    path('assign-roles/bulk/', views.BulkAssignRoleView.as_view(), name='assign-roles-bulk'),
 ]
\ No newline at end of file
@@ -4,36 +4,123 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.auth.models import Group
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenObtainPairView
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 
+from .authentication import revoke_tokens
+from .filters import filter_users, search_users
 from .models import User
-from .serializers import UserSerializer, GroupSerializer
+from .pagination import KeysetPagination
+from .serializers import BulkAssignRoleSerializer, BulkUserSerializer, UserSerializer, GroupSerializer
 from .permissions import IsAdminOrSuperUser, IsSuperUser
+from .roles import invalidate_all_roles, invalidate_roles
+from .tasks import provisioning_status, start_provisioning
+
+USER_LIST_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name')
+
+
+class UserPagination(KeysetPagination):
+    ordering = ('username', 'id')
+
+
+class UserSearchPagination(KeysetPagination):
+    ordering = ('-rank', 'id')
+
+
+class GroupPagination(KeysetPagination):
+    ordering = ('name', 'id')
+
 
 # --- User Views ---
 class UserListCreateView(APIView):    
-    authentication_classes = [JWTAuthentication]
-
     def get(self, request):
         if not IsAdminOrSuperUser().has_permission(request, self):
             return Response(
                 {"message": "An ordinary User doesn't have any access to get this info."},
                 status=status.HTTP_403_FORBIDDEN
             )
-        users = User.objects.all().order_by('username')[:10]
-        serializer = UserSerializer(users, many=True)
-        return Response({'users': serializer.data})
+        queryset = filter_users(User.objects.only(*USER_LIST_FIELDS), request.query_params)
+        term = request.query_params.get('q', '').strip()
+        if term:
+            queryset = search_users(queryset, term)
+            paginator = UserSearchPagination()
+        else:
+            paginator = UserPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = UserSerializer(page, many=True, context={'request': request})
+        return Response({'users': serializer.data, **paginator.get_links()})
 
     def post(self, request):
-        serializer = UserSerializer(data=request.data)
+        serializer = UserSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class UserBulkCreateView(APIView):
+    """
+    Queue many users at once; passwords are hashed by background chunk
+    tasks. Duplicate and taken usernames are reported per item up front.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+
+    def post(self, request):
+        serializer = BulkUserSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        items = serializer.validated_data['users']
+        taken = set(User.objects.filter(
+            username__in=[item['username'] for item in items]
+        ).values_list('username', flat=True))
+
+        errors = {}
+        users = []
+        seen = set()
+        for index, item in enumerate(items):
+            if item['username'] in taken:
+                errors[index] = "A user with that username already exists."
+            elif item['username'] in seen:
+                errors[index] = "Duplicate username in this request."
+            else:
+                seen.add(item['username'])
+                users.append(item)
+
+        results = [{'index': index, 'error': error} for index, error in errors.items()]
+        if not users:
+            return Response({'queued': 0, 'errors': results}, status=status.HTTP_409_CONFLICT)
+
+        job_id = start_provisioning(users, request.user.pk)
+        return Response(
+            {
+                'job_id': job_id,
+                'queued': len(users),
+                'errors': results,
+                'status_url': reverse('user-bulk-status', args=[job_id]),
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class UserBulkStatusView(APIView):
+    """
+    Progress of a provisioning job, for the admin who started it and for
+    superusers.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+
+    def get(self, request, job_id):
+        job = provisioning_status(job_id)
+        # job admin lain diperlakukan seperti tidak ada
+        if job is None or (not request.user.is_superuser and job['requested_by'] != str(request.user.pk)):
+            raise Http404
+        return Response(job)
+
+
 class UserDetailView(APIView):
     permission_classes = [IsAuthenticated]
     def get_object(self, pk):
@@ -46,12 +133,12 @@ class UserDetailView(APIView):
 
     def get(self, request, pk):
         user = self.get_object(pk=pk)
-        serializer = UserSerializer(user)
+        serializer = UserSerializer(user, context={'request': request})
         return Response(serializer.data)
 
     def put(self, request, pk):
         user = self.get_object(pk=pk)
-        serializer = UserSerializer(user, data=request.data)
+        serializer = UserSerializer(user, data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -65,12 +152,13 @@ class UserDetailView(APIView):
 # --- Group Views ---
 class GroupListCreateView(APIView):
     def get(self, request):
-        groups = Group.objects.all().order_by('name')[:10]
-        serializer = GroupSerializer(groups, many=True)
-        return Response({'groups': serializer.data})
+        paginator = GroupPagination()
+        page = paginator.paginate_queryset(Group.objects.all(), request, view=self)
+        serializer = GroupSerializer(page, many=True, context={'request': request})
+        return Response({'groups': serializer.data, **paginator.get_links()})
 
     def post(self, request):
-        serializer = GroupSerializer(data=request.data)
+        serializer = GroupSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -88,12 +176,12 @@ class GroupDetailView(APIView):
 
     def get(self, request, pk):
         group = self.get_object(pk)
-        serializer = GroupSerializer(group)
+        serializer = GroupSerializer(group, context={'request': request})
         return Response(serializer.data)
 
     def put(self, request, pk):
         group = self.get_object(pk)
-        serializer = GroupSerializer(group, data=request.data)
+        serializer = GroupSerializer(group, data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -104,9 +192,13 @@ class GroupDetailView(APIView):
         group.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+# --- Auth ---
+class LoginView(TokenObtainPairView):
+    # percobaan password dibatasi per IP
+    throttle_scope = 'login'
+
 # --- Assign Role ---
 class AssignRoleView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, IsSuperUser]
 
     def post(self, request):
@@ -122,10 +214,67 @@ class AssignRoleView(APIView):
         user = get_object_or_404(User, pk=user_id)
         group = get_object_or_404(Group, pk=group_id)
         user.groups.add(group)
+        # role baru langsung berlaku, tanpa bergantung pada signal m2m_changed saja
+        invalidate_roles(user)
 
         return Response(
             {
                 "message": f"User '{user.username}' has been added to group '{group.name}'."
             },
             status=status.HTTP_201_CREATED
-        )
\ No newline at end of file
+        )
+
+
+class BulkAssignRoleView(APIView):
+    """
+    Add many users to groups with one insert into the users/groups join
+    table; pairs that already exist are skipped.
+    """
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def post(self, request):
+        serializer = BulkAssignRoleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        items = serializer.validated_data['assignments']
+        user_ids = set(User.objects.filter(
+            pk__in={item['user_id'] for item in items}
+        ).values_list('pk', flat=True))
+        group_ids = set(Group.objects.filter(
+            pk__in={item['group_id'] for item in items}
+        ).values_list('pk', flat=True))
+
+        errors = {}
+        pairs = set()
+        for index, item in enumerate(items):
+            if item['user_id'] not in user_ids:
+                errors[index] = "User not found."
+            elif item['group_id'] not in group_ids:
+                errors[index] = "Group not found."
+            else:
+                pairs.add((item['user_id'], item['group_id']))
+
+        if pairs:
+            Membership = User.groups.through
+            with transaction.atomic():
+                Membership.objects.bulk_create(
+                    [Membership(user_id=user_id, group_id=group_id) for user_id, group_id in pairs],
+                    ignore_conflicts=True
+                )
+                # bulk_create tidak mengirim m2m_changed
+                invalidate_all_roles()
+                revoke_tokens(*{user_id for user_id, _ in pairs})
+
+        results = [
+            {'index': index, 'status': 'error', 'error': errors[index]} if index in errors
+            else {'index': index, 'status': 'assigned'}
+            for index in range(len(items))
+        ]
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif pairs:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_409_CONFLICT
+        return Response({'assigned': len(pairs), 'results': results}, status=response_status)
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'django.contrib.postgres',
     'core.apps.CoreConfig',
     'events.apps.EventsConfig',
     'payments.apps.PaymentsConfig',
@@ -64,6 +65,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'dico_event.urls'
@@ -96,7 +98,11 @@ DATABASES = {
         'USER': os.getenv('DATABASE_USER'),
         'PASSWORD': os.getenv('DATABASE_PASSWORD'),
         'HOST': os.getenv('DATABASE_HOST'),
-        'PORT': os.getenv('DATABASE_PORT')
+        'PORT': os.getenv('DATABASE_PORT'),
+        'OPTIONS': {
+            # ambang %> (trigram word similarity) untuk toleransi typo di event search
+            'options': '-c pg_trgm.word_similarity_threshold=0.4',
+        },
     }
 }
 
@@ -144,15 +150,40 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# true: user dibangun dari claim access token tanpa query ke tabel users
+AUTH_STATELESS_JWT = os.getenv('AUTH_STATELESS_JWT', 'false').lower() == 'true'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
+        'core.authentication.StatelessJWTAuthentication'
+        if AUTH_STATELESS_JWT else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # token bucket di Redis, dipakai bersama semua node
+    'DEFAULT_THROTTLE_CLASSES': (
+        'core.throttling.UserBucketThrottle',
+        'core.throttling.IPBucketThrottle',
+        'core.throttling.ScopedBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'user': os.getenv('THROTTLE_RATE_USER', '600/min'),
+        'ip': os.getenv('THROTTLE_RATE_IP', '1200/min'),
+        # hanya request tulis ke endpoint dengan throttle_scope
+        'login': os.getenv('THROTTLE_RATE_LOGIN', '10/min'),
+        'registrations': os.getenv('THROTTLE_RATE_REGISTRATIONS', '30/min'),
+        'payments': os.getenv('THROTTLE_RATE_PAYMENTS', '30/min'),
+        'uploads': os.getenv('THROTTLE_RATE_UPLOADS', '20/min'),
+    },
+    # jumlah reverse proxy tepercaya di depan app; 0 = pakai REMOTE_ADDR,
+    # X-Forwarded-For dari client tidak dipercaya untuk bucket per IP
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=3),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'core.authentication.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.authentication.RoleTokenRefreshSerializer',
 }
 
 # Redis
@@ -167,6 +198,31 @@ CACHES = {
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
+CELERY_BEAT_SCHEDULE = {
+    'expire-registration-holds': {
+        'task': 'payments.tasks.expire_registration_holds',
+        'schedule': 60.0,
+    },
+    # jaring pengaman; intake webhook juga memicu consumer langsung
+    'process-payment-webhooks': {
+        'task': 'payments.tasks.process_payment_webhooks',
+        'schedule': 10.0,
+    },
+}
+
+# Registration hold: seat ditahan selama ini (detik) sampai payment dibuat
+REGISTRATION_HOLD_TTL = int(os.getenv('REGISTRATION_HOLD_TTL', 15 * 60))
+REGISTRATION_HOLD_SWEEP_BATCH_SIZE = int(os.getenv('REGISTRATION_HOLD_SWEEP_BATCH_SIZE', 500))
+
+# Waiting room: masa berlaku token admission dan umur antrean di Redis (detik)
+ADMISSION_TOKEN_TTL = int(os.getenv('ADMISSION_TOKEN_TTL', 10 * 60))
+ADMISSION_QUEUE_TTL = int(os.getenv('ADMISSION_QUEUE_TTL', 24 * 60 * 60))
+
+# Payment gateway webhook
+PAYMENT_WEBHOOK_SECRET = os.getenv('PAYMENT_WEBHOOK_SECRET')
+PAYMENT_WEBHOOK_TOLERANCE = int(os.getenv('PAYMENT_WEBHOOK_TOLERANCE', 5 * 60))
+PAYMENT_WEBHOOK_BATCH_SIZE = int(os.getenv('PAYMENT_WEBHOOK_BATCH_SIZE', 500))
+PAYMENT_WEBHOOK_CONSUMER_LOCK_TIMEOUT = int(os.getenv('PAYMENT_WEBHOOK_CONSUMER_LOCK_TIMEOUT', 5 * 60))
 
 # Mailtrap Settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -0,0 +1,143 @@
+"""
+Virtual waiting room for high-demand events.
+
+Clients join a per-event queue in Redis and get a position from an INCR
+counter. A head pointer moves forward at the event's `admission_rate`
+(registrations per second). Nothing has to run in the background: every
+join and status poll moves the head by the time elapsed since the last
+move, inside one Lua call. Once a position is at or below the head, the
+client gets a signed admission token. Registration requires that token
+while the event has a waiting room.
+
+    admission:<event>:seq         last handed-out position
+    admission:<event>:head        last admitted position
+    admission:<event>:advanced_at when head last moved (ms)
+    admission:<event>:rate        admission_rate copied from the event
+    admission:<event>:positions   hash user id -> position
+"""
+import math
+import time
+from django.conf import settings
+from django.core import signing
+from core.redis_client import get_script
+
+ADMISSION_TOKEN_SALT = "events.admission"
+ADMISSION_TOKEN_HEADER = "X-Admission-Token"
+
+KEY_PREFIX = "admission:{}:"
+KEY_NAMES = ('seq', 'head', 'advanced_at', 'rate', 'positions')
+
+# Majukan head sesuai rate, dipakai bersama oleh join dan status.
+# KEYS = seq, head, advanced_at, rate, positions; ARGV[1] = sekarang (ms)
+ADVANCE = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(redis.call('GET', KEYS[4]) or '0')
+local seq = tonumber(redis.call('GET', KEYS[1]) or '0')
+local head = tonumber(redis.call('GET', KEYS[2]) or '0')
+local advanced_at = tonumber(redis.call('GET', KEYS[3]) or ARGV[1])
+if rate > 0 and head < seq then
+    local admit = math.floor((now - advanced_at) * rate / 1000)
+    if admit > 0 then
+        head = math.min(seq, head + admit)
+        -- KEEPTTL: SET biasa menghapus TTL antrean yang dipasang join
+        redis.call('SET', KEYS[2], head, 'KEEPTTL')
+        -- sisa waktu yang belum jadi satu admission tetap dihitung
+        advanced_at = advanced_at + math.floor(admit * 1000 / rate)
+    end
+else
+    -- antrean kosong: jangan kumpulkan jatah admission untuk lonjakan berikutnya
+    advanced_at = now
+end
+redis.call('SET', KEYS[3], advanced_at, 'KEEPTTL')
+"""
+
+# ARGV[2] = user id, ARGV[3] = rate, ARGV[4] = TTL antrean (detik)
+JOIN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    -- antrean baru atau sudah expired: head lama tidak boleh langsung meloloskan posisi baru.
+    -- head dibuat di sini supaya ikut di-EXPIRE; ADVANCE hanya menimpanya dengan KEEPTTL
+    redis.call('DEL', KEYS[3], KEYS[5])
+    redis.call('SET', KEYS[2], 0)
+end
+redis.call('SET', KEYS[4], ARGV[3])
+local position = redis.call('HGET', KEYS[5], ARGV[2])
+if not position then
+    position = redis.call('INCR', KEYS[1])
+    redis.call('HSET', KEYS[5], ARGV[2], position)
+end
+""" + ADVANCE + """
+for i = 1, #KEYS do
+    redis.call('EXPIRE', KEYS[i], tonumber(ARGV[4]))
+end
+return {tonumber(position), head, rate}
+"""
+
+# ARGV[2] = user id
+STATUS_SCRIPT = """
+local position = redis.call('HGET', KEYS[5], ARGV[2])
+if not position then
+    return {0, 0, 0}
+end
+""" + ADVANCE + """
+return {tonumber(position), head, rate}
+"""
+
+
+def _keys(event_id):
+    prefix = KEY_PREFIX.format(event_id)
+    return [prefix + name for name in KEY_NAMES]
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _status(event_id, user_id, position, head, rate):
+    """
+    Status payload; admitted clients also get their admission token.
+    """
+    if not position:
+        return None
+    ahead = max(position - head, 0)
+    data = {"position": position, "ahead": ahead, "admitted": ahead == 0}
+    if ahead == 0:
+        data["admission_token"] = signing.dumps(
+            {"event": str(event_id), "user": str(user_id)},
+            salt=ADMISSION_TOKEN_SALT
+        )
+    else:
+        data["retry_after"] = math.ceil(ahead / rate) if rate else None
+    return data
+
+
+def join(event, user_id):
+    """
+    Put `user_id` in the queue of `event`; joining again keeps the position.
+    """
+    result = get_script(JOIN_SCRIPT)(
+        keys=_keys(event.pk),
+        args=[_now_ms(), str(user_id), event.admission_rate, settings.ADMISSION_QUEUE_TTL]
+    )
+    return _status(event.pk, user_id, *result)
+
+
+def status(event_id, user_id):
+    """
+    Queue status of `user_id`, or None if they have not joined. Only Redis
+    is touched, so clients can poll this cheaply.
+    """
+    result = get_script(STATUS_SCRIPT)(keys=_keys(event_id), args=[_now_ms(), str(user_id)])
+    return _status(event_id, user_id, *result)
+
+
+def is_admitted(token, event_id, user_id):
+    """
+    True if `token` is an unexpired admission token for this event and user.
+    """
+    if not token:
+        return False
+    try:
+        admission = signing.loads(token, salt=ADMISSION_TOKEN_SALT, max_age=settings.ADMISSION_TOKEN_TTL)
+    except signing.BadSignature:
+        return False
+    return admission == {"event": str(event_id), "user": str(user_id)}
@@ -0,0 +1,180 @@
+"""
+Prefix autocomplete for event names and locations.
+
+Terms live in Redis sorted sets where every member has score 0, so the set
+is ordered lexicographically and ZRANGEBYLEX answers a prefix in
+O(log n + limit) without touching Postgres. Each term is indexed from the
+start of every word ("jakarta jazz festival", "jazz festival", "festival"),
+so typing any word of a name finds it.
+
+Members carry what the response needs after a separator, so a lookup is a
+single round trip:
+
+    name:     "<term>\\x00<event id>\\x00<name>"
+    location: "<term>\\x00<location>"
+
+Locations are shared between events; a per-location reference count decides
+when the last event using it is gone and its members can be removed.
+"""
+import json
+from core.redis_client import get_redis, get_script
+
+KEY_NAMES = "autocomplete:events:name"
+KEY_LOCATIONS = "autocomplete:events:location"
+# event id -> {"name", "location"} yang terakhir diindex, untuk cleanup saat update/delete
+KEY_INDEXED = "autocomplete:events:indexed"
+# location -> jumlah event yang memakainya
+KEY_LOCATION_REFS = "autocomplete:events:location_refs"
+
+KEYS = (KEY_NAMES, KEY_LOCATIONS, KEY_INDEXED, KEY_LOCATION_REFS)
+
+FIELDS = ('name', 'location')
+
+SEPARATOR = "\x00"
+# code point tertinggi; dalam UTF-8 lebih besar dari karakter valid lain setelah prefix
+MAX_CHAR = "\U0010ffff"
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+# Kurangi ref count location; hapus member-nya kalau tidak ada event lain yang memakai.
+# KEYS[1] = ref count hash, KEYS[2] = location zset
+# ARGV[1] = location, ARGV[2..] = member location
+RELEASE_LOCATION_SCRIPT = """
+local refs = redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+if refs <= 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    for i = 2, #ARGV do
+        redis.call('ZREM', KEYS[2], ARGV[i])
+    end
+end
+return refs
+"""
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def _terms(text):
+    words = normalize(text).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def name_members(event_id, name):
+    return [SEPARATOR.join((term, str(event_id), name)) for term in _terms(name)]
+
+
+def location_members(location):
+    return [SEPARATOR.join((term, location)) for term in _terms(location)]
+
+
+def _add(pipe, event_id, name, location, keys=KEYS):
+    key_names, key_locations, key_indexed, key_location_refs = keys
+    members = name_members(event_id, name)
+    if members:
+        pipe.zadd(key_names, dict.fromkeys(members, 0))
+    if location:
+        pipe.zadd(key_locations, dict.fromkeys(location_members(location), 0))
+        pipe.hincrby(key_location_refs, location, 1)
+    pipe.hset(key_indexed, str(event_id), json.dumps({"name": name, "location": location}))
+
+
+def _remove(pipe, event_id, indexed):
+    members = name_members(event_id, indexed['name'])
+    if members:
+        pipe.zrem(KEY_NAMES, *members)
+    if indexed['location']:
+        get_script(RELEASE_LOCATION_SCRIPT)(
+            keys=[KEY_LOCATION_REFS, KEY_LOCATIONS],
+            args=[indexed['location'], *location_members(indexed['location'])],
+            client=pipe
+        )
+    pipe.hdel(KEY_INDEXED, str(event_id))
+
+
+def _update(event_id, current):
+    def update(pipe):
+        previous = pipe.hget(KEY_INDEXED, str(event_id))
+        indexed = json.loads(previous) if previous is not None else None
+        if indexed == current:
+            return
+        pipe.multi()
+        if indexed is not None:
+            _remove(pipe, event_id, indexed)
+        if current is not None:
+            _add(pipe, event_id, current['name'], current['location'])
+
+    # WATCH: kalau index ditulis request lain di antara baca dan MULTI,
+    # transaksi diulang dengan nilai terbaru supaya term lama tidak tertinggal
+    get_redis().transaction(update, KEY_INDEXED)
+
+
+def index_event(event_id, name, location):
+    """
+    Add or refresh one event. Terms from the previously indexed name and
+    location are removed first, so renames do not leave stale suggestions.
+    """
+    _update(event_id, {"name": name, "location": location})
+
+
+def remove_event(event_id):
+    _update(event_id, None)
+
+
+def rebuild(events, chunk_size=1000):
+    """
+    Rebuild the whole index from `events`, an iterable of (id, name, location).
+
+    Everything is written to temporary keys and swapped in with RENAME in a
+    single MULTI, so lookups never see a half-built index.
+    """
+    client = get_redis()
+    temp_keys = tuple(f"{key}:rebuild" for key in KEYS)
+    client.delete(*temp_keys)
+
+    count = 0
+    pipe = client.pipeline(transaction=False)
+    for event_id, name, location in events:
+        _add(pipe, event_id, name, location, keys=temp_keys)
+        count += 1
+        if count % chunk_size == 0:
+            pipe.execute()
+    pipe.execute()
+
+    pipe = client.pipeline()
+    for temp_key, key in zip(temp_keys, KEYS):
+        # RENAME gagal kalau key sumber tidak ada (index kosong)
+        if client.exists(temp_key):
+            pipe.rename(temp_key, key)
+        else:
+            pipe.delete(key)
+    pipe.execute()
+    return count
+
+
+def _prefix_range(key, prefix, count):
+    term = normalize(prefix)
+    return get_redis().zrangebylex(key, f"[{term}", f"[{term}{MAX_CHAR}", start=0, num=count)
+
+
+def suggest_names(prefix, limit=DEFAULT_LIMIT):
+    # satu event bisa match lewat beberapa kata, ambil lebih banyak lalu dedupe
+    suggestions = {}
+    for member in _prefix_range(KEY_NAMES, prefix, limit * 3):
+        _, event_id, name = member.split(SEPARATOR, 2)
+        suggestions.setdefault(event_id, {"id": event_id, "name": name})
+        if len(suggestions) == limit:
+            break
+    return list(suggestions.values())
+
+
+def suggest_locations(prefix, limit=DEFAULT_LIMIT):
+    suggestions = []
+    for member in _prefix_range(KEY_LOCATIONS, prefix, limit * 3):
+        location = member.split(SEPARATOR, 1)[1]
+        if location not in suggestions:
+            suggestions.append(location)
+            if len(suggestions) == limit:
+                break
+    return suggestions
@@ -0,0 +1,56 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from .models import SEARCH_CONFIG
+
+EXACT_FILTERS = ('category', 'status', 'location')
+
+# query param -> lookup untuk window start_time
+START_TIME_FILTERS = (
+    ('start_after', 'start_time__gte'),
+    ('start_before', 'start_time__lt'),
+)
+
+
+def parse_datetime_param(name, value):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Invalid datetime, use ISO 8601 format."})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_events(queryset, params):
+    for field in EXACT_FILTERS:
+        value = params.get(field)
+        if value:
+            queryset = queryset.filter(**{field: value})
+
+    for param, lookup in START_TIME_FILTERS:
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: parse_datetime_param(param, value)})
+
+    return queryset
+
+
+def search_events(queryset, term):
+    """
+    Full-text match on `search_vector` (GIN) OR trigram word similarity on
+    `name` (GIN gin_trgm_ops) for typos, annotated with a combined `rank`.
+    """
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.annotate(
+        # cast ke double supaya nilai rank di cursor bisa dibandingkan persis
+        rank=Cast(
+            SearchRank(F('search_vector'), query) + TrigramWordSimilarity(term, 'name'),
+            FloatField()
+        )
+    ).filter(Q(search_vector=query) | Q(name__trigram_word_similar=term))
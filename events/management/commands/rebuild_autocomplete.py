@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from events.autocomplete import rebuild
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis prefix index used by event name/location autocomplete."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        events = Event.objects.values_list('id', 'name', 'location').iterator(chunk_size=options['chunk_size'])
+        count = rebuild(events, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} event(s) for autocomplete"))
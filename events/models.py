@@ -1,7 +1,11 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from core.models import User
 import uuid
 
+SEARCH_CONFIG = 'simple'
+
 # Create your models here.
 class Event(models.Model):
     id = models.UUIDField(default=uuid.uuid4, unique=True, primary_key=True, editable=False)
@@ -14,20 +18,66 @@ class Event(models.Model):
     status = models.CharField()
     quota = models.IntegerField()
     category = models.CharField(null=True)
+    # registrasi per detik yang diizinkan lewat waiting room; kosong = tanpa waiting room
+    admission_rate = models.PositiveIntegerField(null=True, blank=True)
+    # generated column, diisi Postgres sendiri setiap insert/update
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('category', 'location', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # nilai saat di-load, dipakai signal untuk menghitung selisih quota
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def __str__(self):
         return self.name
 
     class Meta:
         db_table = 'events'
+        indexes = [
+            # sort key untuk keyset pagination + filter yang sering dipakai
+            models.Index(fields=['start_time', 'id'], name='events_start_time_id_idx'),
+            models.Index(fields=['category', 'start_time', 'id'], name='events_category_start_idx'),
+            models.Index(fields=['status', 'start_time', 'id'], name='events_status_start_idx'),
+            models.Index(fields=['location', 'start_time', 'id'], name='events_location_start_idx'),
+            GinIndex(fields=['search_vector'], name='events_search_vector_idx'),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='events_name_trgm_idx'),
+        ]
 
 class EventPoster(models.Model):
     id = models.UUIDField(default=uuid.uuid4, unique=True, primary_key=True, editable=False)
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
-    image = models.ImageField()
+    # satu object di bucket = satu poster; upload-complete yang dikirim ulang tidak membuat duplikat
+    image = models.ImageField(unique=True)
+    content_type = models.CharField(max_length=50, default='image/jpeg')
 
     def __str__(self):
         return self.event.name
 
     class Meta:
-        db_table = 'event_posters'
\ No newline at end of file
+        db_table = 'event_posters'
+
+class EventPosterVariant(models.Model):
+    id = models.UUIDField(default=uuid.uuid4, unique=True, primary_key=True, editable=False)
+    poster = models.ForeignKey(EventPoster, on_delete=models.CASCADE, related_name='variants')
+    size = models.CharField(max_length=20)
+    image = models.ImageField()
+    width = models.IntegerField()
+    height = models.IntegerField()
+    content_type = models.CharField(max_length=50, default='image/webp')
+
+    def __str__(self):
+        return f'{self.poster_id} ({self.size})'
+
+    class Meta:
+        db_table = 'event_poster_variants'
+        unique_together = ('poster', 'size')
\ No newline at end of file
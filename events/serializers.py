@@ -1,9 +1,14 @@
 from rest_framework import serializers
-from rest_framework.reverse import reverse
+from core.links import HypermediaLinksMixin
+from PIL import Image
 from .models import Event, EventPoster
+from .storage import POSTER_CONTENT_TYPES
 from core.models import User
 
-class EventSerializer(serializers.HyperlinkedModelSerializer):
+POSTER_MAX_SIZE = 500 * 1024
+
+class EventSerializer(HypermediaLinksMixin, serializers.HyperlinkedModelSerializer):
+    link_routes = ('event-list', 'event-detail')
     _links = serializers.SerializerMethodField()
     organizer_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
 
@@ -11,36 +16,7 @@ class EventSerializer(serializers.HyperlinkedModelSerializer):
         model = Event
         fields = ['id', 'organizer_id', 'name', 'description',
                   'location', 'start_time', 'end_time', 'status',
-                  'quota', 'category', '_links']
-
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('event-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('event-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('event-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('event-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            },
-        ]
+                  'quota', 'category', 'admission_rate', '_links']
 
 class EventPosterSerializer(serializers.ModelSerializer):
     class Meta:
@@ -48,7 +24,19 @@ class EventPosterSerializer(serializers.ModelSerializer):
         fields = ['id', 'event', 'image']
     
     def validate_image(self, value):
-        max_size = 500 * 1024
-        if value.size > max_size:
+        if value.size > POSTER_MAX_SIZE:
             raise serializers.ValidationError("Image size should not exceed 500KB.")
-        return value
\ No newline at end of file
+        # tipe dari format yang dideteksi Pillow, bukan Content-Type kiriman client
+        content_type = Image.MIME.get(value.image.format)
+        if content_type not in POSTER_CONTENT_TYPES:
+            raise serializers.ValidationError("Image must be a JPEG, PNG or WebP file.")
+        value.content_type = content_type
+        return value
+
+class PosterUploadPolicySerializer(serializers.Serializer):
+    event = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all())
+    filename = serializers.CharField(max_length=200)
+    content_type = serializers.ChoiceField(choices=POSTER_CONTENT_TYPES)
+
+class PosterUploadCompleteSerializer(serializers.Serializer):
+    upload_token = serializers.CharField()
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from redis import RedisError
+from core.cache import bump_generation
+from .autocomplete import index_event, remove_event
+from .models import Event, EventPoster, EventPosterVariant
+from dico_event.logging_config import logger
+
+
+@receiver([post_save, post_delete], sender=Event, dispatch_uid='events_bump_generation')
+def bump_event_generation(sender, **kwargs):
+    bump_generation('events')
+
+
+@receiver([post_save, post_delete], sender=EventPoster, dispatch_uid='event_posters_bump_generation')
+@receiver([post_save, post_delete], sender=EventPosterVariant, dispatch_uid='event_poster_variants_bump_generation')
+def bump_event_poster_generation(sender, **kwargs):
+    bump_generation('event_posters')
+
+
+def _update_autocomplete(func, *args):
+    # index autocomplete bisa di-rebuild, jangan gagalkan request karena Redis
+    try:
+        func(*args)
+    except RedisError as e:
+        logger.error(f"Autocomplete index update failed: {str(e)}")
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events_index_autocomplete')
+def index_event_autocomplete(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: _update_autocomplete(index_event, instance.pk, instance.name, instance.location)
+    )
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='events_remove_autocomplete')
+def remove_event_autocomplete(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: _update_autocomplete(remove_event, pk))
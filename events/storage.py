@@ -0,0 +1,117 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import urllib3
+from django.core.cache import cache
+from minio import Minio
+from minio.datatypes import PostPolicy
+
+bucket_name = os.getenv('MINIO_BUCKET_NAME')
+
+# di atas ukuran ini put_object memakai multipart upload (minimum S3: 5MB)
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+
+PRESIGNED_URL_EXPIRY = timedelta(hours=1)
+# TTL cache lebih pendek dari expiry, jadi URL yang dikirim ke client selalu masih berlaku
+PRESIGNED_URL_CACHE_TIMEOUT = 50 * 60
+CACHE_KEY_PRESIGNED_URL = "poster_url_{}"
+
+UPLOAD_POLICY_EXPIRY = timedelta(minutes=15)
+
+# satu-satunya tipe yang boleh disajikan lewat response-content-type
+POSTER_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+
+
+@lru_cache(maxsize=None)
+def get_minio_client():
+    """
+    One client per process. Its urllib3 pool keeps connections to MinIO
+    open across requests instead of reconnecting for every upload.
+    """
+    http_client = urllib3.PoolManager(
+        maxsize=int(os.getenv('MINIO_POOL_SIZE', 10)),
+        timeout=urllib3.Timeout(connect=5, read=60),
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    return Minio(
+        endpoint=os.getenv('MINIO_ENDPOINT_URL'),
+        access_key=os.getenv('MINIO_ACCESS_KEY'),
+        secret_key=os.getenv('MINIO_SECRET_KEY'),
+        secure=False,
+        # region diset supaya presign tidak perlu request GetBucketLocation
+        region=os.getenv('MINIO_REGION', 'us-east-1'),
+        http_client=http_client
+    )
+
+
+def upload_fileobj(object_name, file, content_type):
+    """
+    Stream an uploaded file straight to MinIO without a local temp copy.
+    """
+    file.seek(0)
+    return get_minio_client().put_object(
+        bucket_name,
+        object_name,
+        file,
+        length=file.size,
+        content_type=content_type,
+        part_size=UPLOAD_PART_SIZE
+    )
+
+
+def _presigned_url_key(object_name):
+    return CACHE_KEY_PRESIGNED_URL.format(hashlib.md5(object_name.encode()).hexdigest())
+
+
+def get_presigned_urls(objects):
+    """
+    Presigned GET URLs for `objects`, a list of (object name, content type),
+    signed at most once per cache TTL. Returns a dict of object name -> URL.
+    Content types outside POSTER_CONTENT_TYPES are served as a download.
+    """
+    content_types = {
+        name: content_type if content_type in POSTER_CONTENT_TYPES else 'application/octet-stream'
+        for name, content_type in objects
+    }
+    keys = {name: _presigned_url_key(name) for name in content_types}
+    cached = cache.get_many(keys.values())
+
+    urls = {}
+    signed = {}
+    for name, key in keys.items():
+        if key in cached:
+            urls[name] = cached[key]
+            continue
+        url = get_minio_client().presigned_get_object(
+            bucket_name,
+            name,
+            expires=PRESIGNED_URL_EXPIRY,
+            response_headers={"response-content-type": content_types[name]}
+        )
+        urls[name] = signed[key] = url
+
+    if signed:
+        cache.set_many(signed, timeout=PRESIGNED_URL_CACHE_TIMEOUT)
+    return urls
+
+
+def get_upload_url():
+    # URL yang bisa dijangkau browser; signature POST policy tidak terikat ke host
+    endpoint = os.getenv('MINIO_PUBLIC_URL') or f"http://{os.getenv('MINIO_ENDPOINT_URL')}"
+    return f"{endpoint.rstrip('/')}/{bucket_name}"
+
+
+def presigned_upload_policy(object_name, content_type, max_size):
+    """
+    Form fields for a browser POST straight to MinIO. The policy pins the
+    object key and content type and caps the body at `max_size` bytes.
+    """
+    policy = PostPolicy(bucket_name, datetime.now(timezone.utc) + UPLOAD_POLICY_EXPIRY)
+    policy.add_equals_condition("key", object_name)
+    policy.add_equals_condition("Content-Type", content_type)
+    policy.add_content_length_range_condition(1, max_size)
+
+    fields = get_minio_client().presigned_post_policy(policy)
+    fields.update({"key": object_name, "Content-Type": content_type})
+    return {"url": get_upload_url(), "fields": fields}
@@ -0,0 +1,76 @@
+from io import BytesIO
+from celery import shared_task
+from PIL import Image, ImageOps
+from core.cache import bump_generation
+from .models import EventPoster, EventPosterVariant
+from .storage import bucket_name, get_minio_client
+from dico_event.logging_config import logger
+
+# size class -> sisi terpanjang dalam pixel
+POSTER_SIZES = {
+    'thumb': 320,
+    'medium': 800,
+    'large': 1600,
+}
+WEBP_QUALITY = 80
+
+
+def _load_original(object_name):
+    response = get_minio_client().get_object(bucket_name, object_name)
+    try:
+        image = Image.open(BytesIO(response.read()))
+        image.load()
+    finally:
+        response.close()
+        response.release_conn()
+
+    # hormati orientasi EXIF dari kamera HP sebelum resize
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    return image
+
+
+@shared_task
+def generate_poster_variants(poster_id):
+    poster = EventPoster.objects.filter(pk=poster_id).first()
+    if poster is None:
+        logger.warning(f"Poster {poster_id} not found, skipping variant generation")
+        return f'Poster {poster_id} not found'
+
+    original = _load_original(poster.image.name)
+    base_name = poster.image.name.rsplit('.', 1)[0]
+    client = get_minio_client()
+
+    variants = []
+    for size, max_side in POSTER_SIZES.items():
+        image = original.copy()
+        # thumbnail() hanya mengecilkan, gambar kecil tidak di-upscale
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY)
+        length = buffer.tell()
+        buffer.seek(0)
+
+        object_name = f"{base_name}_{size}.webp"
+        client.put_object(bucket_name, object_name, buffer, length=length, content_type='image/webp')
+        variants.append(EventPosterVariant(
+            poster=poster,
+            size=size,
+            image=object_name,
+            width=image.width,
+            height=image.height,
+            content_type='image/webp'
+        ))
+
+    EventPosterVariant.objects.bulk_create(
+        variants,
+        update_conflicts=True,
+        unique_fields=['poster', 'size'],
+        update_fields=['image', 'width', 'height', 'content_type']
+    )
+    # bulk_create tidak mengirim post_save
+    bump_generation('event_posters')
+    logger.info(f"Generated {len(variants)} variant(s) for poster {poster_id}")
+    return f'{len(variants)} variants generated for poster {poster_id}'
@@ -1,3 +1,116 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+import uuid
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+from core.models import User
+from core.redis_client import get_redis
+from . import admission
+from .models import Event
+from .serializers import EventPosterSerializer
+from .storage import get_presigned_urls
 
-# Create your tests here.
+
+class AdmissionQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100, admission_rate=1
+        )
+
+    def setUp(self):
+        self.keys = admission._keys(self.event.pk)
+        get_redis().delete(*self.keys)
+        self.now = 1_000_000
+
+    def join(self):
+        with mock.patch('events.admission._now_ms', return_value=self.now):
+            return admission.join(self.event, uuid.uuid4())
+
+    def test_polling_keeps_queue_ttl(self):
+        user_id = uuid.uuid4()
+        with mock.patch('events.admission._now_ms', return_value=self.now):
+            admission.join(self.event, user_id)
+            self.join()
+        self.now += 5000
+        with mock.patch('events.admission._now_ms', return_value=self.now):
+            admission.status(self.event.pk, user_id)
+
+        client = get_redis()
+        self.assertEqual(client.get(self.keys[1]), '2')
+        for key in self.keys:
+            self.assertGreater(client.ttl(key), 0, key)
+
+    def test_join_after_queue_expired_starts_from_new_head(self):
+        for _ in range(3):
+            self.join()
+        self.now += 10000
+        self.join()
+        self.assertEqual(get_redis().get(self.keys[1]), '4')
+
+        # seq dan positions expired, head dari antrean lama masih ada
+        get_redis().delete(self.keys[0], self.keys[4])
+        first, second = self.join(), self.join()
+        self.assertEqual((first['position'], second['position']), (1, 2))
+        self.assertFalse(first['admitted'])
+        self.assertEqual(second['ahead'], 2)
+
+
+class PosterContentTypeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+        )
+
+    def upload(self, image_format, content_type):
+        buffer = BytesIO()
+        Image.new('RGB', (4, 4)).save(buffer, format=image_format)
+        image = SimpleUploadedFile('poster.png', buffer.getvalue(), content_type=content_type)
+        return EventPosterSerializer(data={'event': self.event.pk, 'image': image})
+
+    def test_content_type_comes_from_image_format(self):
+        serializer = self.upload('JPEG', 'text/html')
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['image'].content_type, 'image/jpeg')
+
+    def test_rejects_image_format_outside_allowed_types(self):
+        serializer = self.upload('GIF', 'image/png')
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('image', serializer.errors)
+
+    def test_presigned_url_never_serves_unknown_content_type(self):
+        client = mock.Mock()
+        client.presigned_get_object.return_value = 'http://minio/poster'
+        with mock.patch('events.storage.get_minio_client', return_value=client):
+            get_presigned_urls([(f'event_posters/{uuid.uuid4()}.html', 'text/html')])
+        headers = client.presigned_get_object.call_args.kwargs['response_headers']
+        self.assertEqual(headers['response-content-type'], 'application/octet-stream')
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', 'api.example.com'])
+class EventLinksCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+        )
+
+    def test_cached_links_follow_request_host(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('user', 'user@example.com', 'password'))
+        for url in (f'/api/events/{self.event.pk}/', '/api/events/'):
+            client.get(url)
+            data = client.get(url, HTTP_HOST='api.example.com').json()
+            links = data['events'][0]['_links'] if 'events' in data else data['_links']
+            self.assertEqual(links[1]['href'], f'http://api.example.com/api/events/{self.event.pk}/', url)
@@ -3,7 +3,13 @@ from . import views
 
 urlpatterns = [
     path('events/', views.EventListCreateView.as_view(), name='event-list'),
+    path('events/search/', views.EventSearchView.as_view(), name='event-search'),
+    path('events/autocomplete/', views.EventAutocompleteView.as_view(), name='event-autocomplete'),
     path('events/<uuid:pk>/', views.EventDetailView.as_view(), name='event-detail'),
     path('events/upload/', views.EventPosterView.as_view(), name='event-poster'),
+    path('events/upload/presign/', views.EventPosterUploadPolicyView.as_view(), name='event-poster-presign'),
+    path('events/upload/complete/', views.EventPosterUploadCompleteView.as_view(), name='event-poster-complete'),
+    path('events/<uuid:pk>/queue/', views.EventQueueView.as_view(), name='event-queue'),
+    path('events/<uuid:pk>/sales/', views.EventSalesView.as_view(), name='event-sales'),
     path('events/<uuid:pk>/poster/', views.EventPosterDetailView.as_view(), name='event-poster-detal')
 ]
\ No newline at end of file
@@ -2,82 +2,152 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.http import Http404
-from .serializers import EventSerializer, EventPosterSerializer
+from .serializers import (
+    EventSerializer, EventPosterSerializer, PosterUploadPolicySerializer,
+    PosterUploadCompleteSerializer, POSTER_MAX_SIZE
+)
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from core.permissions import IsOwnerOrAdminOrSuperUser
+from core.roles import has_role
 from django.shortcuts import get_object_or_404
+from django.core import signing
 from django.core.cache import cache
-import tempfile
-import json
+from django.db import transaction
+from django.utils.text import get_valid_filename
+from minio.error import S3Error
+from django.utils.http import urlencode
+from core.pagination import KeysetPagination
+from core.links import cache_variant
+from core.cache import make_key, render_entry, entry_response
+import hashlib
 import os
 import uuid
-from minio import Minio
-from .models import Event
+from .models import Event, EventPoster
+from .filters import filter_events, search_events
+from . import admission, autocomplete
+from .storage import (
+    bucket_name, get_minio_client, get_presigned_urls, presigned_upload_policy,
+    upload_fileobj, UPLOAD_POLICY_EXPIRY
+)
+from .tasks import POSTER_SIZES, generate_poster_variants
+from tickets.sales import event_summary
 from dico_event.logging_config import logger
 
-def get_minio_client():
-    return Minio(
-        endpoint=os.getenv('MINIO_ENDPOINT_URL'),
-        access_key=os.getenv('MINIO_ACCESS_KEY'),
-        secret_key=os.getenv('MINIO_SECRET_KEY'),
-        secure=False
-    )
+CACHE_KEY_LIST = "event_list_{}"
+CACHE_KEY_DETAIL = "event_detail_{}"
+CACHE_KEY_POSTERS = "event_posters_{}"
 
-bucket_name = os.getenv('MINIO_BUCKET_NAME')
+UPLOAD_TOKEN_SALT = "events.poster-upload"
 
-CACHE_KEY_LIST = "event_list"
-CACHE_KEY_DETAIL = "event_detail_{}"
 
-class EventListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+class EventPagination(KeysetPagination):
+    ordering = ('start_time', 'id')
+
+
+class EventSearchPagination(KeysetPagination):
+    ordering = ('-rank', 'id')
+
+
+def list_cache_key(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(query.encode()).hexdigest()
+    # link halaman dan _links absolut, jadi host ikut menentukan isi entry
+    return make_key('events', CACHE_KEY_LIST.format(digest) + cache_variant(request))
+
 
+class EventListCreateView(APIView):
     def get_permissions(self):
         if self.request.method == 'POST':
             return [IsAuthenticated()]
         return [IsAuthenticated()]
 
     def get(self, request):
-        events = cache.get(CACHE_KEY_LIST)
+        cache_key = list_cache_key(request)
+        events = cache.get(cache_key)
         if not events:
             logger.info("Event list retrieved from database")
-            events = Event.objects.all().order_by('name')[:10]
-            cache.get(CACHE_KEY_LIST)
-            serializer = EventSerializer(events, many=True)
+            queryset = filter_events(Event.objects.all(), request.query_params)
+            paginator = EventPagination()
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = EventSerializer(page, many=True, context={'request': request})
 
-            events_data = json.dumps(serializer.data, default=str)
-            cache.set(CACHE_KEY_LIST, events_data, timeout=3600)
-            events = events_data
+            events = render_entry({"events": serializer.data, **paginator.get_links()})
+            cache.set(cache_key, events, timeout=3600)
             data_source = 'database'
         else:
             logger.info("Event list retrieved from cache")
             data_source = 'cache'
 
-        response = Response({"events": json.loads(events)})
-        response['X-Data-Source'] = data_source
-        return response
+        return entry_response(request, events, data_source)
 
     def post(self, request):
-        serializer = EventSerializer(data=request.data)
+        serializer = EventSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            if not request.user.is_superuser and not request.user.groups.filter(name__in=['admin', 'organizer']).exists():
+            if not request.user.is_superuser and not has_role(request.user, 'admin', 'organizer'):
                 logger.warning(f"Unauthorized event creation attempt by user {request.user}")
                 return Response(
                     {"error": "You don't have permission to create an event."},
                     status=status.HTTP_403_FORBIDDEN
                 )
             event = serializer.save()
-            cache.delete(CACHE_KEY_LIST)
             logger.info(f"Event {event.id} created by {request.user}")
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         logger.error(f"Event creation failed: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class EventDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class EventSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = search_events(filter_events(Event.objects.all(), request.query_params), term)
+        paginator = EventSearchPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = EventSerializer(page, many=True, context={'request': request})
+
+        logger.info(f"Event search '{term}' returned {len(page)} result(s) for {request.user}")
+        return Response({"events": serializer.data, **paginator.get_links()})
+
 
+class EventAutocompleteView(APIView):
+    """
+    Search-as-you-type suggestions served from the Redis prefix index only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        prefix = autocomplete.normalize(request.query_params.get('q', ''))
+        if not prefix:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        field = request.query_params.get('field')
+        if field is not None and field not in autocomplete.FIELDS:
+            return Response(
+                {"error": f"field must be one of: {', '.join(autocomplete.FIELDS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(int(request.query_params.get('limit', autocomplete.DEFAULT_LIMIT)), autocomplete.MAX_LIMIT)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {}
+        if field in (None, 'name'):
+            data['names'] = autocomplete.suggest_names(prefix, limit)
+        if field in (None, 'location'):
+            data['locations'] = autocomplete.suggest_locations(prefix, limit)
+        return Response(data)
+
+
+class EventDetailView(APIView):
     def get_permissions(self):
         if self.request.method == "GET":
             return [AllowAny()]
@@ -93,37 +163,30 @@ class EventDetailView(APIView):
             raise Http404
 
     def get(self, request, pk):
-        cache_key = CACHE_KEY_DETAIL.format(pk)
+        cache_key = make_key('events', CACHE_KEY_DETAIL.format(pk) + cache_variant(request))
         event_data = cache.get(cache_key)
 
         if not event_data:
             logger.info(f"Event {pk} retrieved from database")
             event = self.get_object(pk)
-            serializer = EventSerializer(event)
-            
-            event_data = json.dumps(serializer.data, default=str)
+            serializer = EventSerializer(event, context={'request': request})
+
+            event_data = render_entry(serializer.data)
             cache.set(cache_key, event_data, timeout=3600)
             data_source = 'database'
         else:
             logger.info(f"Event {pk} retrieved from cache")
             data_source = 'cache'
 
-        response = Response(json.loads(event_data))
-        response['X-Data-Source'] = data_source
-        return response
+        return entry_response(request, event_data, data_source)
 
     def put(self, request, pk):
         event = self.get_object(pk)
         self.check_object_permissions(request, event) 
-        serializer = EventSerializer(event, data=request.data, partial=True)
+        serializer = EventSerializer(event, data=request.data, partial=True, context={'request': request})
 
         if serializer.is_valid():
             event = serializer.save()
-            cache.set(
-                CACHE_KEY_DETAIL.format(pk),
-                json.dumps(serializer.data, default=str),
-                timeout=3600
-            )
             logger.info(f"Event {event.id} updated by {request.user}")
             return Response(serializer.data)
 
@@ -134,13 +197,49 @@ class EventDetailView(APIView):
         event = self.get_object(pk)
         self.check_object_permissions(request, event)
         event.delete()
-        cache.delete(CACHE_KEY_DETAIL.format(pk))
         logger.info(f"Event {pk} deleted by {request.user}")
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class EventQueueView(APIView):
+    """
+    Waiting room of an event: POST joins the queue, GET polls the position
+    and returns an admission token once it is the client's turn.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        event = get_object_or_404(Event, pk=pk)
+        if not event.admission_rate:
+            return Response({"error": "This event has no waiting room."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queue_status = admission.join(event, request.user.pk)
+        logger.info(f"User {request.user} joined the queue of event {pk} at position {queue_status['position']}")
+        return Response(queue_status, status=status.HTTP_201_CREATED)
+
+    def get(self, request, pk):
+        queue_status = admission.status(pk, request.user.pk)
+        if queue_status is None:
+            return Response({"error": "You have not joined the queue of this event."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(queue_status)
+
+
+class EventSalesView(APIView):
+    """
+    Live sales dashboard of an event for its organizer and admins, read
+    from the ticket sales counters instead of aggregating registrations.
+    """
+    permission_classes = [IsAuthenticated, IsOwnerOrAdminOrSuperUser]
+
+    def get(self, request, pk):
+        event = get_object_or_404(Event.objects.only('id', 'organizer_id', 'name', 'quota'), pk=pk)
+        self.check_object_permissions(request, event)
+        logger.info(f"Sales of event {pk} retrieved by {request.user}")
+        return Response(event_summary(event))
+
+
 class EventPosterView(APIView):
-    authentication_classes = [JWTAuthentication]
+    throttle_scope = 'uploads'
     parser_classes = [MultiPartParser, FormParser]
 
     def get_permissions(self):
@@ -149,54 +248,168 @@ class EventPosterView(APIView):
     def post(self, request):
         serializer = EventPosterSerializer(data=request.data)
         if serializer.is_valid():
-            file = request.data.get('image')
+            file = serializer.validated_data.get('image')
             if not file:
                 logger.warning("Poster upload failed: No image provided")
                 return Response({"message": "Image is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                for chunk in file.chunks():
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
+            if not bucket_name:
+                logger.error("Poster upload failed: Minio bucket not configured")
+                return Response({"error": "Bucket not configured"}, status=500)
 
             try:
                 object_name = f"event_posters/{uuid.uuid4()}_{file.name}"
-                client = get_minio_client()
-                if not bucket_name:
-                    logger.error("Poster upload failed: Minio bucket not configured")
-                    return Response({"error": "Bucket not configured"}, status=500)
-                client.fput_object(bucket_name, object_name, temp_file_path, content_type=file.content_type)
+                upload_fileobj(object_name, file, file.content_type)
 
-                poster = serializer.save(image=object_name)
+                poster = serializer.save(image=object_name, content_type=file.content_type)
                 logger.info(f"Poster {poster.id} uploaded by {request.user}")
+                transaction.on_commit(lambda: generate_poster_variants.delay(str(poster.id)))
             except Exception as e:
                 logger.exception(f"Upload to Minio failed: {str(e)}")
                 return Response({"error": f"Upload to Minio failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            finally:
-                os.remove(temp_file_path)
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         logger.error(f"Poster upload validation failed: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class EventPosterUploadPolicyView(APIView):
+    """
+    Issue a presigned POST policy so the client uploads the poster straight
+    to MinIO; no poster bytes pass through the app worker.
+    """
+    throttle_scope = 'uploads'
+    permission_classes = [IsAuthenticated, IsOwnerOrAdminOrSuperUser]
+
+    def post(self, request):
+        serializer = PosterUploadPolicySerializer(data=request.data)
+        if serializer.is_valid():
+            event = serializer.validated_data['event']
+            self.check_object_permissions(request, event)
+
+            if not bucket_name:
+                logger.error("Poster upload policy failed: Minio bucket not configured")
+                return Response({"error": "Bucket not configured"}, status=500)
+
+            content_type = serializer.validated_data['content_type']
+            filename = get_valid_filename(os.path.basename(serializer.validated_data['filename']))
+            object_name = f"event_posters/{uuid.uuid4()}_{filename}"
+
+            upload = presigned_upload_policy(object_name, content_type, POSTER_MAX_SIZE)
+            upload['upload_token'] = signing.dumps(
+                {
+                    "event": str(event.pk),
+                    "object": object_name,
+                    "content_type": content_type,
+                    "user": str(request.user.pk),
+                },
+                salt=UPLOAD_TOKEN_SALT
+            )
+            logger.info(f"Poster upload policy for event {event.pk} issued to {request.user}")
+            return Response(upload)
+        logger.error(f"Poster upload policy validation failed: {serializer.errors}")
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EventPosterUploadCompleteView(APIView):
+    """
+    Called by the client after its direct upload finished; verifies the
+    stored object and creates the EventPoster row.
+    """
+    throttle_scope = 'uploads'
+    permission_classes = [IsAuthenticated, IsOwnerOrAdminOrSuperUser]
+
+    def post(self, request):
+        serializer = PosterUploadCompleteSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                upload = signing.loads(
+                    serializer.validated_data['upload_token'],
+                    salt=UPLOAD_TOKEN_SALT,
+                    # beri waktu untuk upload yang dimulai tepat sebelum policy expired
+                    max_age=UPLOAD_POLICY_EXPIRY * 2
+                )
+            except signing.BadSignature:
+                logger.warning(f"Invalid poster upload token from {request.user}")
+                return Response({"error": "Invalid or expired upload token."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if upload['user'] != str(request.user.pk):
+                logger.warning(f"User {request.user} tried to complete an upload issued to another user")
+                return Response({"error": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+            event = get_object_or_404(Event, pk=upload['event'])
+            self.check_object_permissions(request, event)
+
+            try:
+                stat = get_minio_client().stat_object(bucket_name, upload['object'])
+            except S3Error:
+                logger.warning(f"Poster upload completion failed: object {upload['object']} not found")
+                return Response({"error": "Uploaded image not found."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if stat.size > POSTER_MAX_SIZE or stat.content_type != upload['content_type']:
+                logger.warning(f"Poster upload completion failed: object {upload['object']} violates upload policy")
+                return Response({"error": "Uploaded image does not match the upload policy."}, status=status.HTTP_400_BAD_REQUEST)
+
+            poster, created = EventPoster.objects.get_or_create(
+                image=upload['object'],
+                defaults={'event': event, 'content_type': upload['content_type']}
+            )
+            if not created:
+                # panggilan ulang untuk object yang sama: kembalikan poster yang sudah ada
+                return Response(EventPosterSerializer(poster).data, status=status.HTTP_200_OK)
+            logger.info(f"Poster {poster.id} uploaded directly by {request.user}")
+            transaction.on_commit(lambda: generate_poster_variants.delay(str(poster.id)))
+            return Response(EventPosterSerializer(poster).data, status=status.HTTP_201_CREATED)
+        logger.error(f"Poster upload completion validation failed: {serializer.errors}")
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class EventPosterDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def get_posters(self, pk):
+        cache_key = make_key('event_posters', CACHE_KEY_POSTERS.format(pk))
+        posters = cache.get(cache_key)
+        if posters is None:
+            queryset = EventPoster.objects.filter(event_id=pk).prefetch_related('variants')
+            posters = [
+                {
+                    "id": poster.id,
+                    "original": (poster.image.name, poster.content_type),
+                    "variants": {
+                        variant.size: (variant.image.name, variant.content_type)
+                        for variant in poster.variants.all()
+                    },
+                }
+                for poster in queryset
+            ]
+            if not posters:
+                get_object_or_404(Event, pk=pk)
+            cache.set(cache_key, posters, timeout=3600)
+        return posters
+
     def get(self, request, pk):
-        event = get_object_or_404(Event, pk=pk)
-        images = event.eventposter_set.all()
-
-        serialized_images = []
-        for image in images:
-            client = get_minio_client()
-            presigned_url = client.presigned_get_object(
-                bucket_name,
-                image.image.name,
-                response_headers={"response-content-type": "image/jpeg"}
+        size = request.query_params.get('size', 'original')
+        if size != 'original' and size not in POSTER_SIZES:
+            return Response(
+                {"error": f"size must be one of: original, {', '.join(POSTER_SIZES)}."},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            serialized_images.append({"id": image.id, "url": presigned_url})
-        
-        logger.info(f"Retrieved {len(images)} poster(s) for event {pk} by {request.user}")
+
+        posters = self.get_posters(pk)
+        served = []
+        for poster in posters:
+            # variant belum jadi (task masih jalan) -> fallback ke file original
+            if size in poster["variants"]:
+                served.append((poster["id"], size, *poster["variants"][size]))
+            else:
+                served.append((poster["id"], 'original', *poster["original"]))
+
+        urls = get_presigned_urls([(name, content_type) for _, _, name, content_type in served])
+        serialized_images = [
+            {"id": poster_id, "size": served_size, "content_type": content_type, "url": urls[name]}
+            for poster_id, served_size, name, content_type in served
+        ]
+
+        logger.info(f"Retrieved {len(posters)} poster(s) for event {pk} by {request.user}")
         return Response(serialized_images)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from core.filters import apply_filters, parse_uuid_param
+
+REGISTRATION_FILTERS = (
+    ('ticket_id', 'ticket_id', parse_uuid_param),
+    ('event_id', 'ticket_id__event_id', parse_uuid_param),
+    ('user_id', 'user_id', parse_uuid_param),
+    ('status', 'status', None),
+)
+
+PAYMENT_FILTERS = (
+    ('registration_id', 'registration_id', parse_uuid_param),
+    ('event_id', 'registration_id__ticket_id__event_id', parse_uuid_param),
+    ('user_id', 'registration_id__user_id', parse_uuid_param),
+    ('payment_status', 'payment_status', None),
+    ('payment_method', 'payment_method', None),
+)
+
+
+def filter_registrations(queryset, params):
+    return apply_filters(queryset, params, REGISTRATION_FILTERS)
+
+
+def filter_payments(queryset, params):
+    return apply_filters(queryset, params, PAYMENT_FILTERS)
@@ -0,0 +1,46 @@
+"""
+Local stand-in for the payment gateway, for tests and development.
+
+It sends callbacks signed exactly like the real gateway to the webhook
+intake endpoint, so the whole path (signature, queue, batch consumer) can
+be exercised without network access.
+"""
+import json
+import time
+import uuid
+from django.urls import reverse
+from .webhooks import SIGNATURE_HEADER, TIMESTAMP_HEADER, sign
+
+
+class FakeGateway:
+    def __init__(self, client, secret=None):
+        # client: django.test.Client / APIClient
+        self.client = client
+        self.secret = secret
+
+    def event(self, payment_id, status):
+        return {'event_id': f"evt_{uuid.uuid4().hex}", 'payment_id': str(payment_id), 'status': status}
+
+    def send(self, payment_id, status, timestamp=None, signature=None):
+        """
+        Post one callback; `timestamp` / `signature` override the valid
+        values to simulate replayed or forged callbacks.
+        """
+        body = json.dumps(self.event(payment_id, status)).encode()
+        timestamp = str(timestamp or int(time.time()))
+        headers = {
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: signature or sign(body, timestamp, self.secret),
+        }
+        return self.client.post(
+            reverse('payment-webhook'),
+            data=body,
+            content_type='application/json',
+            headers=headers
+        )
+
+    def burst(self, transitions):
+        """
+        Send callbacks for many (payment id, status) pairs back to back.
+        """
+        return [self.send(payment_id, status) for payment_id, status in transitions]
@@ -5,13 +5,43 @@ import uuid
 
 # Create your models here.
 class Registration(models.Model):
+    class Status(models.TextChoices):
+        # seat ditahan sampai hold_expires_at, menunggu payment
+        HELD = 'held'
+        CONFIRMED = 'confirmed'
+        # hold habis, seat sudah dikembalikan ke inventory
+        EXPIRED = 'expired'
+
     id = models.UUIDField(default=uuid.uuid4, unique=True, primary_key=True, editable=False)
     ticket_id = models.ForeignKey(Ticket, on_delete=models.CASCADE)
     user_id = models.ForeignKey(User, on_delete=models.CASCADE)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.CONFIRMED)
+    hold_expires_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # nilai saat di-load, dipakai signal untuk menghitung selisih sales counter
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     class Meta:
         db_table = 'registrations'
         unique_together = ('id', 'ticket_id', 'user_id')
+        indexes = [
+            # sort key keyset pagination + filter yang sering dipakai
+            models.Index(fields=['created_at', 'id'], name='regs_created_id_idx'),
+            models.Index(fields=['ticket_id', 'created_at', 'id'], name='regs_ticket_created_idx'),
+            models.Index(fields=['user_id', 'created_at', 'id'], name='regs_user_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='regs_status_created_idx'),
+            # hanya hold yang masih aktif yang dicari sweeper
+            models.Index(
+                fields=['hold_expires_at'],
+                condition=models.Q(status='held'),
+                name='registrations_hold_expiry_idx'
+            ),
+        ]
 
 class Payment(models.Model):
     id = models.UUIDField(default=uuid.uuid4, unique=True, primary_key=True, editable=False)
@@ -19,9 +49,23 @@ class Payment(models.Model):
     payment_method = models.CharField(max_length=20)
     payment_status = models.CharField(max_length=15)
     amount_paid = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def __str__(self):
         return f'{self.payment_method} is {self.payment_status}'
 
     class Meta:
-        db_table = 'payments'
\ No newline at end of file
+        db_table = 'payments'
+        indexes = [
+            # sort key keyset pagination + filter yang sering dipakai
+            models.Index(fields=['created_at', 'id'], name='payments_created_id_idx'),
+            models.Index(fields=['registration_id', 'created_at', 'id'], name='payments_registration_idx'),
+            models.Index(fields=['payment_status', 'created_at', 'id'], name='payments_status_created_idx'),
+            models.Index(fields=['payment_method', 'created_at', 'id'], name='payments_method_created_idx'),
+        ]
\ No newline at end of file
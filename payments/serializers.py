@@ -1,84 +1,53 @@
 from rest_framework import serializers
-from rest_framework.reverse import reverse
+from core.links import HypermediaLinksMixin
 from .models import Payment, Registration
 from core.models import User
+from tickets.models import Ticket
+from .webhooks import WEBHOOK_STATUSES
 
-class RegistrationSerializer(serializers.ModelSerializer):
+BULK_REGISTRATION_MAX_SIZE = 500
+
+class RegistrationSerializer(HypermediaLinksMixin, serializers.ModelSerializer):
+    link_routes = ('registration-list', 'registration-detail')
     _links = serializers.SerializerMethodField()
     event_name = serializers.CharField(source='ticket_id.event_id.name', read_only=True)
     ticket = serializers.CharField(source='ticket_id.name', read_only=True)
     user = serializers.CharField(source='user_id.username', read_only=True)
     user_email = serializers.CharField(source='user_id.email', read_only=True)
+    # event ikut di-load untuk cek waiting room dan inventory
+    ticket_id = serializers.PrimaryKeyRelatedField(queryset=Ticket.objects.select_related('event_id'))
 
     class Meta:
         model = Registration
-        fields = ['id', 'ticket_id', 'user', 'user_id', 'user_email', 'ticket', 'event_name', '_links']
-
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('registration-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('registration-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('registration-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('registration-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            },
+        fields = [
+            'id', 'ticket_id', 'user', 'user_id', 'user_email', 'ticket', 'event_name',
+            'status', 'hold_expires_at', 'created_at', '_links'
         ]
+        read_only_fields = ['status', 'hold_expires_at']
+
+class BulkRegistrationItemSerializer(serializers.Serializer):
+    ticket_id = serializers.UUIDField()
+    user_id = serializers.UUIDField()
 
-class PaymentSerializer(serializers.ModelSerializer):
+class BulkRegistrationSerializer(serializers.Serializer):
+    registrations = BulkRegistrationItemSerializer(many=True, allow_empty=False, max_length=BULK_REGISTRATION_MAX_SIZE)
+
+class PaymentSerializer(HypermediaLinksMixin, serializers.ModelSerializer):
+    link_routes = ('payment-list', 'payment-detail')
+    link_rels = ('self', 'self', 'update', 'delete')
     _links = serializers.SerializerMethodField()
-    registration = serializers.CharField(source='registration_id.id', read_only=True)
+    # kolom FK sendiri, tanpa load Registration
+    registration = serializers.CharField(source='registration_id_id', read_only=True)
 
     class Meta:
         model = Payment
         fields = [
             'id', 'registration_id', 'payment_method',
-            'payment_status', 'amount_paid', 'registration', '_links'
+            'payment_status', 'amount_paid', 'registration', 'created_at', '_links'
         ]
 
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('payment-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('payment-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "update",
-                "href": reverse('payment-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "delete",
-                "href": reverse('payment-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            }
-        ]
+
+class PaymentWebhookSerializer(serializers.Serializer):
+    event_id = serializers.CharField(max_length=100)
+    payment_id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=WEBHOOK_STATUSES)
@@ -0,0 +1,141 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from core.cache import bump_generation
+from core.signals import deleted_with
+from events.models import Event
+from tickets.inventory import release_many
+from tickets.models import Ticket
+from tickets.sales import PAID, apply as apply_sales, record as record_sales
+from .models import Payment, Registration
+
+
+@receiver([post_save, post_delete], sender=Registration, dispatch_uid='registrations_bump_generation')
+def bump_registration_generation(sender, **kwargs):
+    bump_generation('registrations')
+
+
+@receiver([post_save, post_delete], sender=Payment, dispatch_uid='payments_bump_generation')
+def bump_payment_generation(sender, **kwargs):
+    bump_generation('payments')
+
+
+class _DeletedRows:
+    """
+    Seats and sales of the registrations and payments removed by one
+    delete() call. A cascade sends one signal per row; the changes are
+    summed per ticket and applied by a single callback on commit.
+    """
+    def __init__(self):
+        # ticket id -> seat yang dikembalikan (= sold yang berkurang)
+        self.seats = Counter()
+        # registration id -> revenue paid yang hilang
+        self.revenue = Counter()
+        # registration id -> ticket id, untuk registration yang ikut terhapus
+        self.tickets = {}
+
+    @classmethod
+    def of(cls, origin):
+        rows = getattr(origin, '_deleted_rows', None)
+        if rows is None:
+            rows = origin._deleted_rows = cls()
+            transaction.on_commit(rows)
+        return rows
+
+    def __call__(self):
+        missing = set(self.revenue) - set(self.tickets)
+        if missing:
+            self.tickets.update(Registration.objects.filter(pk__in=missing).values_list('pk', 'ticket_id'))
+        revenue = Counter()
+        for registration_id, amount in self.revenue.items():
+            revenue[self.tickets.get(registration_id)] -= amount
+        revenue.pop(None, None)
+
+        if self.seats:
+            events = dict(Ticket.objects.filter(pk__in=self.seats).values_list('pk', 'event_id'))
+            release_many({
+                (ticket_id, events[ticket_id]): seats
+                for ticket_id, seats in self.seats.items() if ticket_id in events
+            })
+        apply_sales({ticket_id: -seats for ticket_id, seats in self.seats.items()}, revenue)
+
+
+@receiver(pre_delete, sender=Registration, dispatch_uid='registrations_start_delete')
+@receiver(pre_delete, sender=Payment, dispatch_uid='payments_start_delete')
+def start_delete(sender, origin=None, **kwargs):
+    # semua pre_delete dikirim sebelum post_delete pertama: mulai batch baru
+    # untuk delete() ini, batch lama bisa tertinggal dari transaksi yang di-rollback
+    if origin is not None:
+        origin.__dict__.pop('_deleted_rows', None)
+
+
+@receiver(post_delete, sender=Registration, dispatch_uid='registrations_collect_delete')
+def collect_deleted_registration(sender, instance, origin=None, **kwargs):
+    # ticket/event ikut dihapus: counter seat dan sales-nya juga hilang
+    if deleted_with(origin, Ticket, Event):
+        return
+    rows = _DeletedRows.of(origin)
+    rows.tickets[instance.pk] = instance.ticket_id_id
+    # seat registration expired sudah dikembalikan oleh sweeper
+    if instance.status != Registration.Status.EXPIRED:
+        rows.seats[instance.ticket_id_id] += 1
+
+
+def _ticket_of(registration_id, instance):
+    # registration yang sudah ter-load tidak perlu di-query lagi
+    registration = instance.registration_id if Payment.registration_id.is_cached(instance) else None
+    if registration is not None and registration.pk == registration_id:
+        return registration.ticket_id_id
+    return Registration.objects.filter(pk=registration_id).values_list('ticket_id', flat=True).first()
+
+
+@receiver(post_save, sender=Registration, dispatch_uid='registrations_record_sales')
+def record_registration_sales(sender, instance, created, **kwargs):
+    holds_seat = instance.status != Registration.Status.EXPIRED
+    sold, revenue = Counter(), Counter()
+    if created:
+        sold[instance.ticket_id_id] += holds_seat
+    elif hasattr(instance, '_loaded_values'):
+        loaded = instance._loaded_values
+        if 'status' in loaded and 'ticket_id_id' in loaded:
+            old_ticket_id = loaded['ticket_id_id']
+            sold[old_ticket_id] -= loaded['status'] != Registration.Status.EXPIRED
+            sold[instance.ticket_id_id] += holds_seat
+            if old_ticket_id != instance.ticket_id_id:
+                # pindah ticket: revenue payment-nya ikut pindah
+                paid = Payment.objects.filter(
+                    registration_id=instance, payment_status=PAID
+                ).aggregate(total=Sum('amount_paid'))['total'] or 0
+                revenue[old_ticket_id] -= paid
+                revenue[instance.ticket_id_id] += paid
+    record_sales(sold=sold, revenue=revenue)
+    instance._loaded_values = {'status': instance.status, 'ticket_id_id': instance.ticket_id_id}
+
+
+@receiver(post_save, sender=Payment, dispatch_uid='payments_record_sales')
+def record_payment_sales(sender, instance, created, **kwargs):
+    current = {
+        'payment_status': instance.payment_status,
+        'amount_paid': instance.amount_paid,
+        'registration_id_id': instance.registration_id_id,
+    }
+    loaded = {} if created else getattr(instance, '_loaded_values', None)
+    # instance yang tidak di-load dari database: nilai lamanya tidak diketahui
+    if loaded is None or (loaded and loaded.items() >= current.items()):
+        return
+
+    revenue = Counter()
+    if instance.payment_status == PAID:
+        revenue[_ticket_of(instance.registration_id_id, instance)] += instance.amount_paid
+    if loaded.get('payment_status') == PAID and 'amount_paid' in loaded and 'registration_id_id' in loaded:
+        revenue[_ticket_of(loaded['registration_id_id'], instance)] -= loaded['amount_paid']
+    record_sales(revenue=revenue)
+    instance._loaded_values = current
+
+
+@receiver(post_delete, sender=Payment, dispatch_uid='payments_collect_delete')
+def collect_deleted_payment(sender, instance, origin=None, **kwargs):
+    if instance.payment_status == PAID and not deleted_with(origin, Ticket, Event):
+        _DeletedRows.of(origin).revenue[instance.registration_id_id] += instance.amount_paid
@@ -1,8 +1,21 @@
+from collections import Counter
 from celery import shared_task
-from django.core.mail import EmailMultiAlternatives
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from core.cache import bump_generation
+from tickets.inventory import release_many
+from tickets.sales import record as record_sales
+from .models import Registration
+from .webhooks import acknowledge, apply_events, ensure_group, read_batch
+from dico_event.logging_config import logger
 
-@shared_task
-def send_ticket_reminder_email(user_email, username, event_name):
+CACHE_KEY_WEBHOOK_CONSUMER_LOCK = "payment_webhooks_consumer_lock"
+
+
+def _ticket_reminder_email(user_email, username, event_name, connection=None):
     subject = f'Reminder Buat Tiket yang Kamu Pesan'
     
     text_content = f"""Hellow {username},
@@ -48,7 +61,99 @@ def send_ticket_reminder_email(user_email, username, event_name):
     </html>
     """
 
-    email = EmailMultiAlternatives(subject, text_content, 'no-reply@dicotickets.com', [user_email])
+    email = EmailMultiAlternatives(subject, text_content, 'no-reply@dicotickets.com', [user_email], connection=connection)
     email.attach_alternative(html_content, "text/html")
-    email.send()
-    return f'Email sent to {user_email}'
\ No newline at end of file
+    return email
+
+
+@shared_task
+def send_ticket_reminder_email(user_email, username, event_name):
+    _ticket_reminder_email(user_email, username, event_name).send()
+    return f'Email sent to {user_email}'
+
+
+@shared_task
+def send_ticket_reminder_emails(recipients):
+    """
+    Send reminders for many registrations over one SMTP connection.
+    `recipients` is a list of (email, username, event name).
+    """
+    with get_connection() as connection:
+        emails = [
+            _ticket_reminder_email(user_email, username, event_name, connection=connection)
+            for user_email, username, event_name in recipients
+        ]
+        sent = connection.send_messages(emails) or 0
+    return f'{sent} emails sent'
+
+
+def _expire_batch(now, batch_size):
+    with transaction.atomic():
+        # skip_locked: hold yang sedang dikonfirmasi payment dilewati, bukan ditunggu
+        batch = list(
+            Registration.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(status=Registration.Status.HELD, hold_expires_at__lte=now)
+            .values_list('id', 'ticket_id', 'ticket_id__event_id')[:batch_size]
+        )
+        if not batch:
+            return 0
+
+        Registration.objects.filter(pk__in=[row[0] for row in batch]).update(
+            status=Registration.Status.EXPIRED,
+            hold_expires_at=None
+        )
+        seats = Counter((ticket_id, event_id) for _, ticket_id, event_id in batch)
+        transaction.on_commit(lambda: release_many(seats))
+        # update() tidak mengirim post_save
+        bump_generation('registrations')
+        record_sales(sold={ticket_id: -count for (ticket_id, _), count in seats.items()})
+    return len(batch)
+
+
+@shared_task
+def expire_registration_holds(batch_size=None):
+    """
+    Expire unpaid holds and give their seats back, one batch per
+    transaction: one UPDATE and one Redis round trip per batch.
+    """
+    batch_size = batch_size or settings.REGISTRATION_HOLD_SWEEP_BATCH_SIZE
+    now = timezone.now()
+    total = 0
+    while True:
+        expired = _expire_batch(now, batch_size)
+        total += expired
+        if expired < batch_size:
+            break
+
+    if total:
+        logger.info(f"Expired {total} registration hold(s)")
+    return f'{total} registration holds expired'
+
+
+@shared_task
+def process_payment_webhooks(batch_size=None):
+    """
+    Drain the webhook stream batch by batch. Only one consumer runs at a
+    time; extra triggers during a burst return immediately.
+    """
+    if not cache.add(CACHE_KEY_WEBHOOK_CONSUMER_LOCK, 1, timeout=settings.PAYMENT_WEBHOOK_CONSUMER_LOCK_TIMEOUT):
+        return 'Payment webhook consumer already running'
+
+    batch_size = batch_size or settings.PAYMENT_WEBHOOK_BATCH_SIZE
+    processed = changed = 0
+    try:
+        ensure_group()
+        while True:
+            entries = read_batch(batch_size)
+            if not entries:
+                break
+            changed += apply_events([event for _, event in entries])
+            acknowledge([entry_id for entry_id, _ in entries])
+            processed += len(entries)
+    finally:
+        cache.delete(CACHE_KEY_WEBHOOK_CONSUMER_LOCK)
+
+    if processed:
+        logger.info(f"Processed {processed} payment webhook(s), {changed} payment(s) updated")
+    return f'{processed} webhooks processed, {changed} payments updated'
@@ -1,3 +1,297 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+import hashlib
+import time
+import uuid
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.test import APIClient
+from core.idempotency import CACHE_KEY_LOCK, IDEMPOTENCY_HEADER
+from core.models import User
+from core.redis_client import get_redis
+from events.models import Event
+from tickets.inventory import KEY_EVENT, KEY_TICKET, reserve_up_to
+from tickets.models import Ticket
+from .gateway import FakeGateway
+from .models import Payment, Registration
+from .tasks import process_payment_webhooks
+from .webhooks import STREAM_KEY
 
-# Create your tests here.
+
+class ListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        now = timezone.now()
+        event = Event.objects.create(
+            organizer_id=cls.admin, name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100, category='music'
+        )
+        cls.ticket = Ticket.objects.create(
+            event_id=event, name='Regular', price=100000,
+            sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=100
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_registrations(self, count):
+        registrations = []
+        for _ in range(count):
+            username = f'user-{uuid.uuid4().hex[:8]}'
+            user = User.objects.create(username=username, email=f'{username}@example.com')
+            registrations.append(Registration.objects.create(ticket_id=self.ticket, user_id=user))
+        return registrations
+
+    def create_payments(self, count):
+        for registration in self.create_registrations(count):
+            Payment.objects.create(
+                registration_id=registration, payment_method='transfer',
+                payment_status='paid', amount_paid=100000
+            )
+
+    def assertConstantQueries(self, url, key, create):
+        create(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        create(10)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()[key]), 11)
+
+    def test_registration_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/registrations/?page_size=100', 'registrations', self.create_registrations)
+
+    def test_payment_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/payments/?page_size=100', 'payments', self.create_payments)
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRET='test-secret')
+@mock.patch('payments.views.process_payment_webhooks.delay')
+class PaymentWebhookTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        now = timezone.now()
+        event = Event.objects.create(
+            organizer_id=cls.admin, name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100, category='music'
+        )
+        ticket = Ticket.objects.create(
+            event_id=event, name='Regular', price=100000,
+            sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=100
+        )
+        cls.payments = [
+            Payment.objects.create(
+                registration_id=Registration.objects.create(ticket_id=ticket, user_id=cls.admin),
+                payment_method='transfer', payment_status=payment_status, amount_paid=100000
+            )
+            for payment_status in ('pending', 'pending', 'paid')
+        ]
+
+    def setUp(self):
+        get_redis().delete(STREAM_KEY)
+        self.client = APIClient()
+        self.gateway = FakeGateway(self.client, secret='test-secret')
+
+    def process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            process_payment_webhooks(batch_size=2)
+
+    def status_of(self, payment):
+        self.client.force_authenticate(self.admin)
+        return self.client.get(f'/api/payments/{payment.id}/').json()['payment_status']
+
+    def test_burst_is_queued_and_applied_in_batches(self, delay):
+        first, second, paid = self.payments
+
+        responses = self.gateway.burst([
+            (first.id, 'paid'),
+            (second.id, 'failed'),
+            (first.id, 'refunded'),
+            # transisi tidak valid diabaikan
+            (paid.id, 'failed'),
+        ])
+        self.assertEqual([response.status_code for response in responses], [202] * 4)
+        delay.assert_called()
+        self.assertEqual(Payment.objects.get(pk=first.id).payment_status, 'pending')
+
+        self.process()
+        self.assertEqual(self.status_of(first), 'refunded')
+        self.assertEqual(self.status_of(second), 'failed')
+        self.assertEqual(self.status_of(paid), 'paid')
+        self.assertEqual(get_redis().xlen(STREAM_KEY), 0)
+
+    def test_invalid_signature_is_rejected(self, delay):
+        first = self.payments[0]
+        self.assertEqual(self.gateway.send(first.id, 'paid', signature='forged').status_code, 401)
+        stale = int(time.time()) - 3600
+        self.assertEqual(self.gateway.send(first.id, 'paid', timestamp=stale).status_code, 401)
+        self.assertEqual(get_redis().xlen(STREAM_KEY), 0)
+        delay.assert_not_called()
+
+
+class IdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+        now = timezone.now()
+        event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+        )
+        ticket = Ticket.objects.create(
+            event_id=event, name='Regular', price=100000,
+            sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=100
+        )
+        cls.registration = Registration.objects.create(ticket_id=ticket, user_id=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # key baru per test: hasil yang tersimpan di cache tidak bocor antar test
+        self.key = uuid.uuid4().hex
+
+    def pay(self, amount=100000):
+        return self.client.post('/api/payments/', {
+            'registration_id': str(self.registration.id), 'payment_method': 'transfer',
+            'payment_status': 'pending', 'amount_paid': amount,
+        }, format='json', headers={IDEMPOTENCY_HEADER: self.key})
+
+    def payments(self):
+        return Payment.objects.filter(registration_id=self.registration).count()
+
+    def test_retry_replays_stored_response(self):
+        first = self.pay()
+        second = self.pay()
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(self.payments(), 1)
+
+    def test_same_key_with_different_body_is_rejected(self):
+        self.assertEqual(self.pay().status_code, 201)
+        self.assertEqual(self.pay(amount=1).status_code, 422)
+        self.assertEqual(self.payments(), 1)
+
+    def test_server_error_is_not_stored(self):
+        with mock.patch('payments.views.PaymentSerializer.save', side_effect=APIException()):
+            self.assertEqual(self.pay().status_code, 500)
+        response = self.pay()
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(self.payments(), 1)
+
+    def test_duplicate_waits_for_in_flight_request(self):
+        scope = f"{self.user.pk}:POST:/api/payments/:{self.key}"
+        lock_key = CACHE_KEY_LOCK.format(hashlib.sha256(scope.encode()).hexdigest())
+        # request pertama dianggap masih berjalan
+        cache.add(lock_key, 'in-flight')
+
+        with mock.patch('core.idempotency.WAIT_TIMEOUT', 0):
+            self.assertEqual(self.pay().status_code, 409)
+
+        finished = []
+
+        def finish_first_request(seconds):
+            # request pertama selesai saat duplikatnya sedang menunggu
+            if not finished:
+                cache.delete(lock_key)
+                finished.append(self.pay())
+
+        with mock.patch('core.idempotency.time.sleep', side_effect=finish_first_request):
+            response = self.pay()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertEqual(response.json(), finished[0].json())
+        self.assertEqual(self.payments(), 1)
+
+
+class BulkRegistrationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+        )
+        cls.tickets = [
+            Ticket.objects.create(
+                event_id=cls.event, name=f'Ticket {i}', price=100000,
+                sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=10
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        get_redis().delete(KEY_EVENT.format(self.event.pk), *[KEY_TICKET.format(ticket.pk) for ticket in self.tickets])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def register(self, tickets):
+        return self.client.post('/api/registrations/bulk/', {
+            'registrations': [{'ticket_id': str(ticket.pk), 'user_id': str(self.user.pk)} for ticket in tickets]
+        }, format='json')
+
+    def remaining(self, ticket):
+        return int(get_redis().hget(KEY_TICKET.format(ticket.pk), 'remaining'))
+
+    def test_non_admin_holds_one_seat_per_ticket(self):
+        ticket = self.tickets[0]
+        response = self.register([ticket] * 3)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(self.remaining(ticket), 9)
+
+    def test_error_while_reserving_releases_earlier_tickets(self):
+        def fail_on_second(ticket, quantity):
+            if ticket.pk == self.tickets[1].pk:
+                raise ConnectionError('redis down')
+            return reserve_up_to(ticket, quantity)
+
+        with mock.patch('payments.views.reserve_up_to', side_effect=fail_on_second):
+            with self.assertRaises(ConnectionError):
+                self.register(self.tickets)
+        self.assertEqual(self.remaining(self.tickets[0]), 10)
+        self.assertFalse(Registration.objects.exists())
+
+
+class RegistrationMoveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+        )
+        cls.tickets = [
+            Ticket.objects.create(
+                event_id=cls.event, name=f'Ticket {i}', price=100000,
+                sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=10
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        get_redis().delete(KEY_EVENT.format(self.event.pk), *[KEY_TICKET.format(ticket.pk) for ticket in self.tickets])
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_move_releases_event_seat_when_old_ticket_is_not_loaded(self):
+        registration = Registration.objects.create(ticket_id=self.tickets[0], user_id=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f'/api/registrations/{registration.pk}/', {'ticket_id': str(self.tickets[1].pk)}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        # satu registrasi tetap memegang satu kursi event
+        self.assertEqual(int(get_redis().get(KEY_EVENT.format(self.event.pk))), 99)
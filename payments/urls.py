@@ -1,15 +1,20 @@
 from django.urls import path
 from .views import (
-    PaymentListCreateView, PaymentDetailView,
-    RegistrationListCreateView, RegistrationDetailView
+    PaymentListCreateView, PaymentDetailView, PaymentExportView, PaymentWebhookView,
+    RegistrationListCreateView, RegistrationBulkCreateView, RegistrationDetailView,
+    RegistrationExportView
 )
 
 urlpatterns = [
     # Payment endpoints
     path('payments/', PaymentListCreateView.as_view(), name='payment-list'),
+    path('payments/export/', PaymentExportView.as_view(), name='payment-export'),
+    path('payments/webhook/', PaymentWebhookView.as_view(), name='payment-webhook'),
     path('payments/<uuid:pk>/', PaymentDetailView.as_view(), name='payment-detail'),
 
     # Registration endpoints
     path('registrations/', RegistrationListCreateView.as_view(), name='registration-list'),
+    path('registrations/export/', RegistrationExportView.as_view(), name='registration-export'),
+    path('registrations/bulk/', RegistrationBulkCreateView.as_view(), name='registration-bulk'),
     path('registrations/<uuid:pk>/', RegistrationDetailView.as_view(), name='registration-detail'),
 ]
\ No newline at end of file
@@ -1,53 +1,97 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.http import Http404
+from collections import defaultdict
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
 from .models import Payment, Registration
-from .serializers import PaymentSerializer, RegistrationSerializer
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from .exports import EXPORT_TYPES, PAYMENT_COLUMNS, REGISTRATION_COLUMNS, stream_export
+from .filters import PAYMENT_FILTERS, REGISTRATION_FILTERS, filter_payments, filter_registrations
+from .serializers import (
+    BulkRegistrationSerializer, PaymentSerializer, PaymentWebhookSerializer, RegistrationSerializer
+)
+from .webhooks import SIGNATURE_HEADER, TIMESTAMP_HEADER, enqueue, verify_signature
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from core.permissions import IsAdminOrSuperUser
 from django.core.cache import cache
-import json
-from .tasks import send_ticket_reminder_email
+from django.db import transaction
+from core.links import cache_variant
+from core.idempotency import idempotent
+from core.pagination import KeysetPagination
+from core.filters import apply_filters
+from core.cache import bump_generation, make_key, render_entry, entry_response
+from events.admission import ADMISSION_TOKEN_HEADER, is_admitted
+from core.models import User
+from tickets.inventory import InventoryError, SalesClosed, SoldOut, release, release_many, reserve, reserve_up_to
+from tickets.models import Ticket
+from tickets.sales import record as record_sales
+from .tasks import process_payment_webhooks, send_ticket_reminder_email, send_ticket_reminder_emails
 from dico_event.logging_config import logger
 
 CACHE_KEY_PAYMENT_DETAIL = "payment_detail_{}"
 CACHE_KEY_REGIST_DETAIL = "regist_detail_{}"
+CACHE_KEY_WEBHOOK_KICK = "payment_webhooks_kick"
+
+
+class PaymentPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class RegistrationPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
 
 
 class PaymentListCreateView(APIView):
+    throttle_scope = 'payments'
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    queryset = Payment.objects.only(
+        'id', 'registration_id', 'payment_method', 'payment_status', 'amount_paid', 'created_at'
+    )
 
     def get(self, request):
         if IsAdminOrSuperUser().has_permission(request, self):
-            payments = Payment.objects.all()
+            payments = self.queryset.all()
             logger.info(f"Admin {request.user} retrieved all payments")
         else:
-            payments = Payment.objects.filter(registration_id__user_id=request.user)
+            payments = self.queryset.filter(registration_id__user_id=request.user.pk)
             logger.info(f"User {request.user} retrieved own payments")
-        serializer = PaymentSerializer(payments, many=True, context={'request': request})
-        return Response({'payments': serializer.data})
+        payments = filter_payments(payments, request.query_params)
+        paginator = PaymentPagination()
+        page = paginator.paginate_queryset(payments, request, view=self)
+        serializer = PaymentSerializer(page, many=True, context={'request': request})
+        return Response({'payments': serializer.data, **paginator.get_links()})
 
+    @idempotent
     def post(self, request):
         serializer = PaymentSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             reg = serializer.validated_data['registration_id']
-            if not IsAdminOrSuperUser().has_permission(request, self) and reg.user_id != request.user:
+            if not IsAdminOrSuperUser().has_permission(request, self) and reg.user_id_id != request.user.pk:
                 logger.warning(f"User {request.user} tried to create payment for another user’s registration {reg.id}")
                 return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
             
-            payment = serializer.save()
+            with transaction.atomic():
+                # konfirmasi hold hanya kalau belum expired; bersaing aman dengan sweeper
+                if reg.status != Registration.Status.CONFIRMED and not Registration.objects.filter(
+                    pk=reg.pk,
+                    status=Registration.Status.HELD,
+                    hold_expires_at__gt=timezone.now()
+                ).update(status=Registration.Status.CONFIRMED, hold_expires_at=None):
+                    logger.warning(f"Payment rejected for registration {reg.id}: hold expired")
+                    return Response({'error': 'Registration hold has expired.'}, status=status.HTTP_409_CONFLICT)
+                bump_generation('registrations')
+                payment = serializer.save()
             logger.info(f"Payment {payment.id} created by {request.user}")
-            return Response(PaymentSerializer(payment).data, status=status.HTTP_201_CREATED)
+            return Response(PaymentSerializer(payment, context={'request': request}).data, status=status.HTTP_201_CREATED)
         logger.error(f"Payment creation failed by {request.user}: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class PaymentDetailView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
 
     def get_object(self, pk):
         try:
@@ -57,28 +101,26 @@ class PaymentDetailView(APIView):
             raise Http404
 
     def get(self, request, pk):
-        cache_key = CACHE_KEY_PAYMENT_DETAIL.format(pk)
+        cache_key = make_key('payments', CACHE_KEY_PAYMENT_DETAIL.format(pk) + cache_variant(request))
         payment_data = cache.get(cache_key)
 
         if not payment_data:
             logger.info(f"Payment {pk} retrieved from database")
             payment = self.get_object(pk)
-            if not IsAdminOrSuperUser().has_permission(request, self) and payment.registration_id.user_id != request.user:
-                logger.warning(f"User {request.user} tried to access payment {pk} not owned")
-                return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
-
             serializer = PaymentSerializer(payment, context={'request': request})
-            payment_data = dict(serializer.data)
-            cache.set(cache_key, json.dumps(payment_data, default=str), timeout=3600)
+            # owner disimpan di entry supaya cek akses tetap jalan saat cache hit
+            payment_data = render_entry(serializer.data, owner=payment.registration_id.user_id_id)
+            cache.set(cache_key, payment_data, timeout=3600)
             data_source = 'database'
         else:
             logger.info(f"Payment {pk} retrieved from cache")
-            payment_data = json.loads(payment_data)
             data_source = 'cache'
-        
-        response = Response(payment_data)
-        response['X-Data-Source'] = data_source
-        return response
+
+        if not IsAdminOrSuperUser().has_permission(request, self) and payment_data['owner'] != request.user.pk:
+            logger.warning(f"User {request.user} tried to access payment {pk} not owned")
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+        return entry_response(request, payment_data, data_source)
 
     def put(self, request, pk):
         payment = self.get_object(pk)
@@ -88,13 +130,8 @@ class PaymentDetailView(APIView):
         serializer = PaymentSerializer(payment, data=request.data, context={'request': request}, partial=True)
         if serializer.is_valid():
             payment = serializer.save()
-            cache.set(
-                CACHE_KEY_PAYMENT_DETAIL.format(pk),
-                json.dumps(dict(PaymentSerializer(payment).data), default=str),
-                timeout=3600
-            )
             logger.info(f"Payment {pk} updated by {request.user}")
-            return Response(PaymentSerializer(payment).data)
+            return Response(PaymentSerializer(payment, context={'request': request}).data)
         logger.error(f"Payment update failed for {pk} by {request.user}: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -104,13 +141,53 @@ class PaymentDetailView(APIView):
             logger.warning(f"User {request.user} tried to delete payment {pk} without permission")
             return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
         payment.delete()
-        cache.delete(CACHE_KEY_PAYMENT_DETAIL.format(pk))
         logger.info(f"Payment {pk} deleted by {request.user}")
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class PaymentWebhookView(APIView):
+    """
+    Gateway callback intake: verify, enqueue, answer 202. Status changes
+    are applied in batches by `process_payment_webhooks`.
+    """
+    # gateway diautentikasi lewat signature, bukan JWT
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # burst callback dari gateway tidak boleh ditolak; antrean yang meredamnya
+    throttle_classes = []
+
+    def post(self, request):
+        body = request.body
+        if not verify_signature(body, request.headers.get(TIMESTAMP_HEADER), request.headers.get(SIGNATURE_HEADER)):
+            logger.warning("Payment webhook rejected: invalid signature")
+            return Response({'error': 'Invalid signature'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return Response({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = PaymentWebhookSerializer(data=payload)
+        if not serializer.is_valid():
+            logger.error(f"Payment webhook validation failed: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        event = {key: str(value) for key, value in serializer.validated_data.items()}
+        enqueue(event)
+        # consumer dipicu paling banyak sekali per detik, selama burst cukup satu yang jalan
+        if cache.add(CACHE_KEY_WEBHOOK_KICK, 1, timeout=1):
+            process_payment_webhooks.delay()
+        logger.info(f"Payment webhook {event['event_id']} queued for payment {event['payment_id']}")
+        return Response({'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+
+
 class RegistrationListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+    throttle_scope = 'registrations'
+    # ticket, event dan user di-join dalam query yang sama, hanya kolom yang dibaca RegistrationSerializer
+    queryset = Registration.objects.select_related('ticket_id__event_id', 'user_id').only(
+        'id', 'status', 'hold_expires_at', 'created_at',
+        'ticket_id', 'ticket_id__name', 'ticket_id__event_id', 'ticket_id__event_id__name',
+        'user_id', 'user_id__username', 'user_id__email'
+    )
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -121,24 +198,57 @@ class RegistrationListCreateView(APIView):
 
     def get(self, request):
         if IsAdminOrSuperUser().has_permission(request, self):
-            registrations = Registration.objects.all()
+            registrations = self.queryset.all()
             logger.info(f"Admin {request.user} retrieved all registrations")
         else:
-            registrations = Registration.objects.filter(user_id=request.user)
+            registrations = self.queryset.filter(user_id=request.user.pk)
             logger.info(f"User {request.user} retrieved own registrations")
-        serializer = RegistrationSerializer(registrations, many=True)
-        return Response({'registrations': serializer.data})
+        registrations = filter_registrations(registrations, request.query_params)
+        paginator = RegistrationPagination()
+        page = paginator.paginate_queryset(registrations, request, view=self)
+        serializer = RegistrationSerializer(page, many=True, context={'request': request})
+        return Response({'registrations': serializer.data, **paginator.get_links()})
 
+    @idempotent
     def post(self, request):
-        serializer = RegistrationSerializer(data=request.data)
+        serializer = RegistrationSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             reg_user = serializer.validated_data['user_id']
-            if not IsAdminOrSuperUser().has_permission(request, self) and reg_user != request.user:
+            is_admin = IsAdminOrSuperUser().has_permission(request, self)
+            if not is_admin and reg_user.pk != request.user.pk:
                 logger.warning(f"User {request.user} tried to register for another user {reg_user}")
                 return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
             
-            registration = serializer.save()
-            logger.info(f"Registration {registration.id} created by {request.user}")
+            ticket = serializer.validated_data['ticket_id']
+            # admin mendaftarkan atas nama user lain tidak lewat waiting room
+            if not is_admin and ticket.event_id.admission_rate and not is_admitted(
+                request.headers.get(ADMISSION_TOKEN_HEADER), ticket.event_id_id, reg_user.pk
+            ):
+                logger.warning(f"Registration by {request.user} for event {ticket.event_id_id} rejected: not admitted")
+                return Response(
+                    {'error': 'A valid admission token from the event waiting room is required.'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            try:
+                reserve(ticket)
+            except InventoryError as e:
+                logger.warning(f"Registration rejected for ticket {ticket.id} by {request.user}: {str(e)}")
+                return Response(
+                    {'error': str(e)},
+                    status=status.HTTP_409_CONFLICT if isinstance(e, SoldOut) else status.HTTP_400_BAD_REQUEST
+                )
+
+            try:
+                with transaction.atomic():
+                    registration = serializer.save(
+                        status=Registration.Status.HELD,
+                        hold_expires_at=timezone.now() + timedelta(seconds=settings.REGISTRATION_HOLD_TTL)
+                    )
+            except Exception:
+                release(ticket.id, ticket.event_id_id)
+                raise
+            logger.info(f"Registration {registration.id} created by {request.user}, held until {registration.hold_expires_at}")
 
             # kirim email reminder
             send_ticket_reminder_email(
@@ -147,14 +257,121 @@ class RegistrationListCreateView(APIView):
                 registration.ticket_id.event_id.name
             )
             logger.info(f"Reminder email sent to {registration.user_id.email} for registration {registration.id}")
-            return Response(RegistrationSerializer(registration).data, status=status.HTTP_201_CREATED)
+            return Response(RegistrationSerializer(registration, context={'request': request}).data, status=status.HTTP_201_CREATED)
         logger.error(f"Registration creation failed by {request.user}: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RegistrationDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class RegistrationBulkCreateView(APIView):
+    """
+    Register many (ticket, user) pairs in one request. Tickets and users are
+    fetched in one query each, seats are reserved once per ticket and all
+    rows go in with a single bulk_create, with a result for every item.
+    """
+    throttle_scope = 'registrations'
+    permission_classes = [IsAuthenticated]
+
+    @idempotent
+    def post(self, request):
+        serializer = BulkRegistrationSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Bulk registration failed by {request.user}: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        items = serializer.validated_data['registrations']
+        is_admin = IsAdminOrSuperUser().has_permission(request, self)
+        tickets = Ticket.objects.select_related('event_id').in_bulk({item['ticket_id'] for item in items})
+        users = User.objects.in_bulk({item['user_id'] for item in items})
+        admission_token = request.headers.get(ADMISSION_TOKEN_HEADER)
+        admitted = {}
+
+        def is_admitted_to(event_id):
+            # token diverifikasi sekali per event, bukan per item
+            if event_id not in admitted:
+                admitted[event_id] = is_admitted(admission_token, event_id, request.user.pk)
+            return admitted[event_id]
 
+        errors = {}
+        requested = defaultdict(list)
+        for index, item in enumerate(items):
+            ticket = tickets.get(item['ticket_id'])
+            user = users.get(item['user_id'])
+            if ticket is None:
+                errors[index] = "Ticket not found."
+            elif user is None:
+                errors[index] = "User not found."
+            elif not is_admin and user.pk != request.user.pk:
+                errors[index] = "Forbidden"
+            elif not is_admin and ticket.event_id.admission_rate and not is_admitted_to(ticket.event_id_id):
+                errors[index] = "A valid admission token from the event waiting room is required."
+            elif not is_admin and requested[ticket.pk]:
+                # sama seperti create tunggal: non-admin hanya menahan satu kursi per tiket per request
+                errors[index] = "Duplicate registration for this ticket."
+            else:
+                requested[ticket.pk].append(index)
+
+        hold_expires_at = timezone.now() + timedelta(seconds=settings.REGISTRATION_HOLD_TTL)
+        reserved = {}
+        registrations = {}
+        try:
+            for ticket_id, indexes in requested.items():
+                ticket = tickets[ticket_id]
+                try:
+                    granted = reserve_up_to(ticket, len(indexes))
+                    error = f"Ticket {ticket.name} is sold out."
+                except SalesClosed as e:
+                    granted, error = 0, str(e)
+                if granted:
+                    reserved[(ticket.pk, ticket.event_id_id)] = granted
+
+                for index in indexes[:granted]:
+                    registrations[index] = Registration(
+                        ticket_id=ticket,
+                        user_id=users[items[index]['user_id']],
+                        status=Registration.Status.HELD,
+                        hold_expires_at=hold_expires_at
+                    )
+                for index in indexes[granted:]:
+                    errors[index] = error
+
+            with transaction.atomic():
+                Registration.objects.bulk_create(registrations.values())
+                # bulk_create tidak mengirim post_save
+                bump_generation('registrations')
+                record_sales(sold={ticket_id: count for (ticket_id, _), count in reserved.items()})
+        except BaseException:
+            # termasuk error Redis di tengah loop: kursi yang sudah di-reserve dikembalikan semua
+            release_many(reserved)
+            raise
+
+        if registrations:
+            send_ticket_reminder_emails.delay([
+                (reg.user_id.email, reg.user_id.username, reg.ticket_id.event_id.name)
+                for reg in registrations.values()
+            ])
+
+        results = []
+        for index in range(len(items)):
+            if index in registrations:
+                results.append({
+                    'index': index,
+                    'status': 'created',
+                    'registration': RegistrationSerializer(registrations[index], context={'request': request}).data
+                })
+            else:
+                results.append({'index': index, 'status': 'error', 'error': errors[index]})
+
+        logger.info(f"Bulk registration by {request.user}: {len(registrations)} of {len(items)} created")
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif registrations:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_409_CONFLICT
+        return Response({'created': len(registrations), 'results': results}, status=response_status)
+
+
+class RegistrationDetailView(APIView):
     def get_permissions(self):
         if self.request.method == 'GET':
             return [IsAuthenticated()]
@@ -170,44 +387,58 @@ class RegistrationDetailView(APIView):
             raise Http404
 
     def get(self, request, pk):
-        cache_key = CACHE_KEY_REGIST_DETAIL.format(pk)
+        cache_key = make_key('registrations', CACHE_KEY_REGIST_DETAIL.format(pk) + cache_variant(request))
         regist_data = cache.get(cache_key)
 
         if not regist_data:
             logger.info(f"Registration {pk} retrieved from database")
             regist = self.get_object(pk)
-            if not IsAdminOrSuperUser().has_permission(request, self) and regist.user_id != request.user:
-                logger.warning(f"User {request.user} tried to access registration {pk} not owned")
-                return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
-
-            serializer = RegistrationSerializer(regist)
-            regist_data = dict(serializer.data)
-            cache.set(cache_key, json.dumps(regist_data, default=str), timeout=3600)
+            serializer = RegistrationSerializer(regist, context={'request': request})
+            regist_data = render_entry(serializer.data, owner=regist.user_id_id)
+            cache.set(cache_key, regist_data, timeout=3600)
             data_source = 'database'
         else:
             logger.info(f"Registration {pk} retrieved from cache")
-            regist_data = json.loads(regist_data)
             data_source = 'cache'
 
-        response = Response(regist_data)
-        response['X-Data-Source'] = data_source
-        return response
+        if not IsAdminOrSuperUser().has_permission(request, self) and regist_data['owner'] != request.user.pk:
+            logger.warning(f"User {request.user} tried to access registration {pk} not owned")
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+
+        return entry_response(request, regist_data, data_source)
 
     def put(self, request, pk):
         if not IsAdminOrSuperUser().has_permission(request, self):
             logger.warning(f"User {request.user} tried to update registration {pk} without permission")
             return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
         reg = self.get_object(pk)
-        serializer = RegistrationSerializer(reg, data=request.data, partial=True)
+        serializer = RegistrationSerializer(reg, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
-            reg = serializer.save()
-            cache.set(
-                CACHE_KEY_REGIST_DETAIL.format(pk),
-                json.dumps(dict(RegistrationSerializer(reg).data), default=str),
-                timeout=3600
-            )
+            # pindah ticket: seat di ticket baru diambil dulu, seat lama dikembalikan setelah commit
+            ticket = serializer.validated_data.get('ticket_id')
+            old_ticket_id = reg.ticket_id_id
+            if ticket is not None and ticket.id != old_ticket_id and reg.status != Registration.Status.EXPIRED:
+                # event lama diambil sebelum save; hash inventory ticket lama bisa sudah evicted
+                old_event_id = reg.ticket_id.event_id_id
+                try:
+                    reserve(ticket)
+                except InventoryError as e:
+                    logger.warning(f"Registration {pk} move to ticket {ticket.id} rejected: {str(e)}")
+                    return Response(
+                        {'error': str(e)},
+                        status=status.HTTP_409_CONFLICT if isinstance(e, SoldOut) else status.HTTP_400_BAD_REQUEST
+                    )
+                try:
+                    with transaction.atomic():
+                        reg = serializer.save()
+                        transaction.on_commit(lambda: release(old_ticket_id, old_event_id))
+                except Exception:
+                    release(ticket.id, ticket.event_id_id)
+                    raise
+            else:
+                reg = serializer.save()
             logger.info(f"Registration {pk} updated by {request.user}")
-            return Response(RegistrationSerializer(reg).data)
+            return Response(RegistrationSerializer(reg, context={'request': request}).data)
         logger.error(f"Registration update failed for {pk} by {request.user}: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -217,6 +448,50 @@ class RegistrationDetailView(APIView):
             return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
         reg = self.get_object(pk)
         reg.delete()
-        cache.delete(CACHE_KEY_REGIST_DETAIL.format(pk))
         logger.info(f"Registration {pk} deleted by {request.user}")
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BaseExportView(APIView):
+    """
+    Admin-only streaming export; `?type=csv` (default) or `?type=ndjson`,
+    plus the same filters as the matching list endpoint.
+    """
+    permission_classes = [IsAdminOrSuperUser]
+    # diisi subclass: nama file, kolom, queryset berurutan, dan filter list endpoint-nya
+    export_name = None
+    columns = None
+    queryset = None
+    filters = ()
+
+    def get(self, request):
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in EXPORT_TYPES:
+            return Response(
+                {'error': f"type must be one of: {', '.join(EXPORT_TYPES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = apply_filters(self.queryset.all(), request.query_params, self.filters)
+        response = StreamingHttpResponse(
+            stream_export(queryset, self.columns, export_type),
+            content_type=EXPORT_TYPES[export_type]
+        )
+        filename = f"{self.export_name}-{timezone.now():%Y%m%d%H%M%S}.{export_type}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        logger.info(f"{self.export_name} export ({export_type}) started by {request.user}")
+        return response
+
+
+class RegistrationExportView(BaseExportView):
+    export_name = 'registrations'
+    columns = REGISTRATION_COLUMNS
+    queryset = Registration.objects.order_by('created_at', 'id')
+    filters = REGISTRATION_FILTERS
+
+
+class PaymentExportView(BaseExportView):
+    export_name = 'payments'
+    columns = PAYMENT_COLUMNS
+    queryset = Payment.objects.order_by('created_at', 'id')
+    filters = PAYMENT_FILTERS
@@ -0,0 +1,157 @@
+"""
+Payment gateway webhook intake.
+
+The endpoint only verifies the HMAC signature and appends the callback to
+a Redis stream, so a burst of callbacks never holds web workers on the
+database. `process_payment_webhooks` reads the stream through a consumer
+group in batches, applies the status transitions with one bulk_update per
+batch and acknowledges the entries afterwards; entries of a consumer that
+died mid-batch stay pending and are picked up again on the next run.
+
+Signature: hex HMAC-SHA256 of "<timestamp>.<raw body>" with
+PAYMENT_WEBHOOK_SECRET, sent in X-Gateway-Signature with the unix
+timestamp in X-Gateway-Timestamp.
+"""
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from django.conf import settings
+from collections import Counter
+from django.db import transaction
+from django.db.models import F
+from redis import ResponseError
+from core.cache import bump_generation
+from core.redis_client import get_redis
+from tickets.sales import PAID, record as record_sales
+from .models import Payment
+from dico_event.logging_config import logger
+
+SIGNATURE_HEADER = 'X-Gateway-Signature'
+TIMESTAMP_HEADER = 'X-Gateway-Timestamp'
+
+STREAM_KEY = "payments:webhooks"
+CONSUMER_GROUP = "payment-webhooks"
+CONSUMER_NAME = "worker"
+
+# status sekarang -> status yang boleh dituju lewat webhook
+TRANSITIONS = {
+    'pending': {'paid', 'failed', 'expired'},
+    'paid': {'refunded'},
+    'failed': set(),
+    'expired': set(),
+    'refunded': set(),
+}
+WEBHOOK_STATUSES = sorted(set().union(*TRANSITIONS.values()))
+
+
+def sign(body, timestamp, secret=None):
+    secret = secret or settings.PAYMENT_WEBHOOK_SECRET
+    message = f"{timestamp}.".encode() + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body, timestamp, signature):
+    if not settings.PAYMENT_WEBHOOK_SECRET or not timestamp or not signature:
+        return False
+    try:
+        age = abs(time.time() - int(timestamp))
+    except ValueError:
+        return False
+    # tolak callback lama yang dikirim ulang oleh pihak lain
+    if age > settings.PAYMENT_WEBHOOK_TOLERANCE:
+        return False
+    return hmac.compare_digest(sign(body, timestamp), signature)
+
+
+def enqueue(event):
+    return get_redis().xadd(STREAM_KEY, {'payload': json.dumps(event)})
+
+
+def ensure_group():
+    """
+    Create the stream and its consumer group if they do not exist yet.
+    """
+    client = get_redis()
+    if client.exists(STREAM_KEY) and any(
+        group['name'] == CONSUMER_GROUP for group in client.xinfo_groups(STREAM_KEY)
+    ):
+        return
+    try:
+        client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id='0', mkstream=True)
+    except ResponseError as e:
+        # consumer lain sempat membuat group lebih dulu
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def read_batch(count):
+    """
+    Next batch of (entry id, event): entries left pending by an earlier run
+    first, then new ones. Call `ensure_group` once before reading.
+    """
+    client = get_redis()
+    for start in ('0', '>'):
+        response = client.xreadgroup(CONSUMER_GROUP, CONSUMER_NAME, {STREAM_KEY: start}, count=count)
+        entries = [
+            (entry_id, json.loads(fields['payload']))
+            for _, messages in response
+            for entry_id, fields in messages
+            if fields
+        ]
+        if entries:
+            return entries
+    return []
+
+
+def acknowledge(entry_ids):
+    pipe = get_redis().pipeline()
+    pipe.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+    # entry yang sudah diproses tidak perlu disimpan lagi
+    pipe.xdel(STREAM_KEY, *entry_ids)
+    pipe.execute()
+
+
+def apply_events(events):
+    """
+    Apply webhook events in stream order with one locked read and one
+    bulk_update. Returns the number of payments whose status changed.
+    """
+    payment_ids = {uuid.UUID(event['payment_id']) for event in events}
+    with transaction.atomic():
+        payments = (
+            Payment.objects
+            .select_for_update(of=('self',))
+            .only('id', 'payment_status', 'amount_paid')
+            .annotate(ticket=F('registration_id__ticket_id'))
+            .in_bulk(payment_ids)
+        )
+        changed = {}
+        revenue = Counter()
+        for event in events:
+            payment = payments.get(uuid.UUID(event['payment_id']))
+            if payment is None:
+                logger.warning(f"Webhook {event.get('event_id')} for unknown payment {event['payment_id']} skipped")
+                continue
+            if event['status'] == payment.payment_status:
+                continue
+            if event['status'] not in TRANSITIONS.get(payment.payment_status, ()):
+                logger.warning(
+                    f"Webhook {event.get('event_id')} skipped: payment {payment.id} "
+                    f"cannot go from {payment.payment_status} to {event['status']}"
+                )
+                continue
+            if payment.payment_status == PAID:
+                revenue[payment.ticket] -= payment.amount_paid
+            elif event['status'] == PAID:
+                revenue[payment.ticket] += payment.amount_paid
+            payment.payment_status = event['status']
+            changed[payment.id] = payment
+
+        if changed:
+            Payment.objects.bulk_update(changed.values(), ['payment_status'])
+            # bulk_update tidak mengirim post_save; entry payment_detail_{} lama jadi stale
+            bump_generation('payments')
+            record_sales(revenue=revenue)
+    return len(changed)
@@ -0,0 +1,9 @@
+from core.filters import apply_filters, parse_uuid_param
+
+TICKET_FILTERS = (
+    ('event_id', 'event_id', parse_uuid_param),
+)
+
+
+def filter_tickets(queryset, params):
+    return apply_filters(queryset, params, TICKET_FILTERS)
@@ -0,0 +1,252 @@
+"""
+Seat inventory for ticket sales.
+
+Remaining seats live in Redis so a registration reserves its seat with one
+Lua call instead of counting rows in Postgres. The script checks and
+decrements both the ticket and its event in one atomic step, so concurrent
+buyers never oversell either quota and never wait on a database lock.
+
+Counters are loaded lazily from the database the first time a ticket is
+sold and can be reset from the database with the `reconcile_inventory`
+command. Once loaded they are never reloaded behind the back of seats
+that are reserved but not committed yet: a quota change adds the
+difference to `remaining`, and a deleted ticket gives its seats back to
+the event.
+
+    inventory:ticket:<id>  hash {remaining, event}
+    inventory:event:<id>   remaining seats across all tickets of the event
+"""
+from django.utils import timezone
+from core.redis_client import get_redis, get_script
+
+KEY_TICKET = "inventory:ticket:{}"
+KEY_EVENT = "inventory:event:{}"
+
+RESERVED = 1
+TICKET_SOLD_OUT = 0
+NOT_LOADED = -1
+EVENT_SOLD_OUT = -2
+
+# KEYS[1] = ticket hash, KEYS[2] = event counter; ARGV[1] = jumlah seat
+RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 or redis.call('EXISTS', KEYS[2]) == 0 then
+    return -1
+end
+local quantity = tonumber(ARGV[1])
+if tonumber(redis.call('HGET', KEYS[1], 'remaining')) < quantity then
+    return 0
+end
+if tonumber(redis.call('GET', KEYS[2])) < quantity then
+    return -2
+end
+redis.call('HINCRBY', KEYS[1], 'remaining', -quantity)
+redis.call('DECRBY', KEYS[2], quantity)
+return 1
+"""
+
+# Seperti RESERVE_SCRIPT, tapi ambil sebanyak yang masih tersedia (maksimal ARGV[1])
+RESERVE_UP_TO_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 or redis.call('EXISTS', KEYS[2]) == 0 then
+    return -1
+end
+local granted = math.min(
+    tonumber(ARGV[1]),
+    tonumber(redis.call('HGET', KEYS[1], 'remaining')),
+    tonumber(redis.call('GET', KEYS[2]))
+)
+if granted <= 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'remaining', -granted)
+redis.call('DECRBY', KEYS[2], granted)
+return granted
+"""
+
+# Tambah ARGV[i] ke KEYS[i] (ticket hash atau event counter). Counter yang
+# belum di-load atau sudah di-drop tidak dibuat ulang; load berikutnya
+# menghitung dari database.
+ADJUST_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local kind = redis.call('TYPE', key)['ok']
+    if kind == 'hash' then
+        redis.call('HINCRBY', key, 'remaining', ARGV[i])
+    elseif kind == 'string' then
+        redis.call('INCRBY', key, ARGV[i])
+    end
+end
+return 1
+"""
+
+# Ticket pindah event: seat yang dipegang ticket pindah ke counter event baru.
+# KEYS[1] = ticket hash, KEYS[2] = event lama, KEYS[3] = event baru
+# ARGV[1] = jumlah seat, ARGV[2] = id event baru
+MOVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'event', ARGV[2])
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('INCRBY', KEYS[2], ARGV[1])
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('DECRBY', KEYS[3], ARGV[1])
+end
+return 1
+"""
+
+
+class InventoryError(Exception):
+    pass
+
+
+class SalesClosed(InventoryError):
+    pass
+
+
+class SoldOut(InventoryError):
+    pass
+
+
+def _keys(ticket_id, event_id):
+    return [KEY_TICKET.format(ticket_id), KEY_EVENT.format(event_id)]
+
+
+def _sold(ticket):
+    from payments.models import Registration
+
+    # registration expired sudah mengembalikan seat-nya
+    registrations = Registration.objects.exclude(status=Registration.Status.EXPIRED)
+    ticket_sold = registrations.filter(ticket_id=ticket.pk).count()
+    event_sold = registrations.filter(ticket_id__event_id=ticket.event_id_id).count()
+    return ticket.quota - ticket_sold, ticket.event_id.quota - event_sold
+
+
+def _load(ticket):
+    ticket_remaining, event_remaining = _sold(ticket)
+    ticket_key, event_key = _keys(ticket.pk, ticket.event_id_id)
+    pipe = get_redis().pipeline()
+    # NX: kalau request lain sudah load lebih dulu, counter-nya yang dipakai
+    pipe.hsetnx(ticket_key, 'remaining', ticket_remaining)
+    pipe.hsetnx(ticket_key, 'event', str(ticket.event_id_id))
+    pipe.set(event_key, event_remaining, nx=True)
+    pipe.execute()
+
+
+def check_sales_window(ticket, now=None):
+    now = now or timezone.now()
+    if now < ticket.sales_start:
+        raise SalesClosed(f"Sales for ticket {ticket.name} have not started yet.")
+    if now >= ticket.sales_end:
+        raise SalesClosed(f"Sales for ticket {ticket.name} have ended.")
+
+
+def reserve(ticket, quantity=1):
+    """
+    Take `quantity` seats of `ticket` or raise SalesClosed / SoldOut.
+    Callers must `release` the seats if the registration is not saved.
+    """
+    check_sales_window(ticket)
+
+    reserve_script = get_script(RESERVE_SCRIPT)
+    keys = _keys(ticket.pk, ticket.event_id_id)
+    result = reserve_script(keys=keys, args=[quantity])
+    if result == NOT_LOADED:
+        _load(ticket)
+        result = reserve_script(keys=keys, args=[quantity])
+
+    if result == TICKET_SOLD_OUT:
+        raise SoldOut(f"Ticket {ticket.name} is sold out.")
+    if result == EVENT_SOLD_OUT:
+        raise SoldOut(f"Event quota for ticket {ticket.name} is sold out.")
+
+
+def reserve_up_to(ticket, quantity):
+    """
+    Take as many of `quantity` seats as are left and return that number.
+    Raises SalesClosed outside the sales window.
+    """
+    check_sales_window(ticket)
+
+    reserve_script = get_script(RESERVE_UP_TO_SCRIPT)
+    keys = _keys(ticket.pk, ticket.event_id_id)
+    granted = reserve_script(keys=keys, args=[quantity])
+    if granted == NOT_LOADED:
+        _load(ticket)
+        granted = reserve_script(keys=keys, args=[quantity])
+    return max(granted, 0)
+
+
+def release(ticket_id, event_id=None, quantity=1):
+    """
+    Give seats back, e.g. after a failed insert or a deleted registration.
+    """
+    client = get_redis()
+    if event_id is None:
+        event_id = client.hget(KEY_TICKET.format(ticket_id), 'event')
+    get_script(ADJUST_SCRIPT)(keys=_keys(ticket_id, event_id), args=[quantity, quantity])
+
+
+def release_many(seats):
+    """
+    Give back seats of many tickets in one round trip. `seats` maps
+    (ticket id, event id) to the number of seats.
+    """
+    adjust_script = get_script(ADJUST_SCRIPT)
+    pipe = get_redis().pipeline(transaction=False)
+    for (ticket_id, event_id), quantity in seats.items():
+        adjust_script(keys=_keys(ticket_id, event_id), args=[quantity, quantity], client=pipe)
+    pipe.execute()
+
+
+def held_seats(ticket_id):
+    """
+    Seats held by the committed registrations of a ticket.
+    """
+    from payments.models import Registration
+
+    return Registration.objects.filter(ticket_id=ticket_id).exclude(status=Registration.Status.EXPIRED).count()
+
+
+def change_ticket_quota(ticket_id, delta):
+    get_script(ADJUST_SCRIPT)(keys=[KEY_TICKET.format(ticket_id)], args=[delta])
+
+
+def change_event_quota(event_id, delta):
+    get_script(ADJUST_SCRIPT)(keys=[KEY_EVENT.format(event_id)], args=[delta])
+
+
+def move_ticket(ticket_id, old_event_id, new_event_id, seats):
+    get_script(MOVE_SCRIPT)(
+        keys=[KEY_TICKET.format(ticket_id), KEY_EVENT.format(old_event_id), KEY_EVENT.format(new_event_id)],
+        args=[seats, str(new_event_id)]
+    )
+
+
+def drop_ticket(ticket_id, event_id, seats):
+    """
+    Forget a deleted ticket and give the `seats` it held back to its event.
+    """
+    pipe = get_redis().pipeline()
+    pipe.delete(KEY_TICKET.format(ticket_id))
+    if seats:
+        get_script(ADJUST_SCRIPT)(keys=[KEY_EVENT.format(event_id)], args=[seats], client=pipe)
+    pipe.execute()
+
+
+def drop_event(event_id):
+    get_redis().delete(KEY_EVENT.format(event_id))
+
+
+def reconcile(ticket):
+    """
+    Overwrite the counters of `ticket` with what the database says.
+
+    Seats reserved by registrations that are still being saved are not in
+    the database yet, so run this while the ticket is not on sale.
+    """
+    ticket_remaining, event_remaining = _sold(ticket)
+    ticket_key, event_key = _keys(ticket.pk, ticket.event_id_id)
+    pipe = get_redis().pipeline()
+    pipe.hset(ticket_key, mapping={'remaining': ticket_remaining, 'event': str(ticket.event_id_id)})
+    pipe.set(event_key, event_remaining)
+    pipe.execute()
+    return ticket_remaining, event_remaining
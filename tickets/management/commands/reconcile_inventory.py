@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from tickets.inventory import reconcile
+from tickets.models import Ticket
+
+
+class Command(BaseCommand):
+    help = "Reset the Redis seat counters of tickets from the registrations in the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tickets', nargs='*', help="Ticket ids, all tickets when omitted.")
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.select_related('event_id')
+        if options['tickets']:
+            tickets = tickets.filter(pk__in=options['tickets'])
+
+        for ticket in tickets.iterator():
+            ticket_remaining, event_remaining = reconcile(ticket)
+            self.stdout.write(f"{ticket.id}: {ticket_remaining} seat(s) left, event {ticket.event_id_id}: {event_remaining}")
+        self.stdout.write(self.style.SUCCESS("Inventory reconciled"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from tickets.sales import reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ticket sales counters from the registrations and payments in the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tickets', nargs='*', help="Ticket ids, all tickets when omitted.")
+
+    def handle(self, *args, **options):
+        rebuilt = reconcile(options['tickets'] or None)
+        self.stdout.write(self.style.SUCCESS(f"Sales counters of {rebuilt} ticket(s) reconciled"))
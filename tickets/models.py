@@ -13,8 +13,36 @@ class Ticket(models.Model):
     sales_end = models.DateTimeField()
     quota = models.IntegerField()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # nilai saat di-load, dipakai signal untuk menghitung selisih quota
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def __str__(self):
         return self.name
     
     class Meta:
-        db_table = 'tickets'
\ No newline at end of file
+        db_table = 'tickets'
+        indexes = [
+            # sort key keyset pagination, dengan dan tanpa filter event
+            models.Index(fields=['sales_start', 'id'], name='tickets_sales_start_id_idx'),
+            models.Index(fields=['event_id', 'sales_start', 'id'], name='tickets_event_sales_start_idx'),
+        ]
+
+
+class TicketSales(models.Model):
+    """
+    Denormalized sales figures of one ticket, kept up to date by
+    `tickets.sales` so the dashboard never aggregates registrations.
+    """
+    ticket_id = models.OneToOneField(Ticket, on_delete=models.CASCADE, primary_key=True, related_name='sales')
+    # registration yang masih memegang seat (held + confirmed)
+    sold = models.IntegerField(default=0)
+    # total amount_paid dari payment berstatus paid
+    revenue = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ticket_sales'
@@ -0,0 +1,146 @@
+"""
+Denormalized sales counters for the organizer dashboard.
+
+Every ticket has a `TicketSales` row with its sold count and revenue.
+Writes to registrations and payments record a delta per ticket; the delta
+is applied with one `UPDATE ... SET sold = sold + n` per ticket once the
+transaction commits, so a rolled-back write never touches the counters
+and the counter row is never locked for the length of a request.
+Event figures are the sum of the few ticket rows of the event.
+
+Rows are created together with their ticket; tickets that predate the
+counters get theirs on the first delta. Rows can be rebuilt from the
+source rows with the `reconcile_sales` command.
+
+    sold     registrations holding a seat (held or confirmed)
+    revenue  amount_paid of payments with status `paid`
+"""
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from .models import Ticket, TicketSales
+
+PAID = 'paid'
+RECONCILE_CHUNK_SIZE = 500
+
+
+def record(sold=None, revenue=None):
+    """
+    Add deltas to the counters once the current transaction commits.
+    `sold` and `revenue` map ticket id to the change for that ticket.
+    """
+    sold = {ticket_id: delta for ticket_id, delta in (sold or {}).items() if delta}
+    revenue = {ticket_id: delta for ticket_id, delta in (revenue or {}).items() if delta}
+    if sold or revenue:
+        # satu callback per write: callback di savepoint yang di-rollback ikut dibuang
+        transaction.on_commit(lambda: apply(sold, revenue))
+
+
+def apply(sold, revenue):
+    now = timezone.now()
+    missing = []
+    for ticket_id in sorted(set(sold) | set(revenue), key=str):
+        updated = TicketSales.objects.filter(ticket_id=ticket_id).update(
+            sold=F('sold') + sold.get(ticket_id, 0),
+            revenue=F('revenue') + revenue.get(ticket_id, 0),
+            updated_at=now
+        )
+        if not updated:
+            missing.append(ticket_id)
+    if missing:
+        # row belum ada: hitung dari database (delta ini sudah ikut ter-commit)
+        rebuild(missing)
+
+
+def rebuild(ticket_ids):
+    """
+    Overwrite the counters of `ticket_ids` with what the source rows say.
+    Ids of deleted tickets are ignored. Returns the rebuilt rows.
+    """
+    from payments.models import Payment, Registration
+
+    ticket_ids = set(Ticket.objects.filter(pk__in=ticket_ids).values_list('pk', flat=True))
+    if not ticket_ids:
+        return []
+    sold = dict(
+        Registration.objects
+        .filter(ticket_id__in=ticket_ids)
+        .exclude(status=Registration.Status.EXPIRED)
+        .values_list('ticket_id')
+        .annotate(count=Count('id'))
+    )
+    revenue = dict(
+        Payment.objects
+        .filter(registration_id__ticket_id__in=ticket_ids, payment_status=PAID)
+        .values_list('registration_id__ticket_id')
+        .annotate(total=Sum('amount_paid'))
+    )
+    rows = [
+        TicketSales(ticket_id_id=ticket_id, sold=sold.get(ticket_id, 0), revenue=revenue.get(ticket_id, 0))
+        for ticket_id in ticket_ids
+    ]
+    return TicketSales.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['ticket_id'],
+        update_fields=['sold', 'revenue', 'updated_at']
+    )
+
+
+def reconcile(ticket_ids=None):
+    """
+    Rebuild the counters of `ticket_ids`, or of every ticket, in chunks.
+    Writes committed while this runs may be counted twice, so run it
+    while the tickets are not on sale.
+    """
+    tickets = Ticket.objects.order_by('pk').values_list('pk', flat=True)
+    if ticket_ids is not None:
+        tickets = tickets.filter(pk__in=ticket_ids)
+
+    rebuilt = 0
+    chunk = []
+    for ticket_id in tickets.iterator(chunk_size=RECONCILE_CHUNK_SIZE):
+        chunk.append(ticket_id)
+        if len(chunk) == RECONCILE_CHUNK_SIZE:
+            rebuilt += len(rebuild(chunk))
+            chunk = []
+    if chunk:
+        rebuilt += len(rebuild(chunk))
+    return rebuilt
+
+
+def event_summary(event):
+    """
+    Dashboard figures of `event` and its tickets from the counter rows.
+    """
+    tickets = (
+        Ticket.objects
+        .filter(event_id=event.pk)
+        .select_related('sales')
+        .only('id', 'name', 'price', 'quota', 'sales__sold', 'sales__revenue')
+        .order_by('sales_start', 'id')
+    )
+    rows = []
+    for ticket in tickets:
+        sales = getattr(ticket, 'sales', None)
+        sold = sales.sold if sales else 0
+        rows.append({
+            'id': ticket.id,
+            'name': ticket.name,
+            'price': ticket.price,
+            'quota': ticket.quota,
+            'sold': sold,
+            'remaining': max(ticket.quota - sold, 0),
+            'revenue': sales.revenue if sales else 0,
+        })
+
+    sold = sum(row['sold'] for row in rows)
+    return {
+        'event': event.pk,
+        'name': event.name,
+        'quota': event.quota,
+        'sold': sold,
+        'remaining': max(event.quota - sold, 0),
+        'revenue': sum(row['revenue'] for row in rows),
+        'tickets': rows,
+    }
@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from rest_framework.reverse import reverse
+from core.links import HypermediaLinksMixin
 from .models import Ticket
 from events.models import Event
 
-class TicketSerializer(serializers.HyperlinkedModelSerializer):
+class TicketSerializer(HypermediaLinksMixin, serializers.HyperlinkedModelSerializer):
+    link_routes = ('ticket-list', 'ticket-detail')
     _links = serializers.SerializerMethodField()
     event_id = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all())
     event = serializers.CharField(source='event_id.name', read_only=True)
@@ -11,33 +12,4 @@ class TicketSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Ticket
         fields = ['id', 'event_id', 'event', 'name', 'price',
-                    'sales_start', 'sales_end', 'quota', '_links']
-
-    def get__links(self, obj):
-        request = self.context.get('request')
-        return [
-            {
-                "rel": "self",
-                "href": reverse('ticket-list', request=request),
-                "action": "POST",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('ticket-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "GET",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('ticket-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "PUT",
-                "types": ["application/json"]
-            },
-            {
-                "rel": "self",
-                "href": reverse('ticket-detail', kwargs={'pk': obj.pk}, request=request),
-                "action": "DELETE",
-                "types": ["application/json"]
-            },
-        ]
\ No newline at end of file
+                    'sales_start', 'sales_end', 'quota', '_links']
\ No newline at end of file
@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from core.cache import bump_generation
+from core.signals import deleted_with
+from events.models import Event
+from .inventory import change_event_quota, change_ticket_quota, drop_event, drop_ticket, held_seats, move_ticket
+from .models import Ticket, TicketSales
+
+# field (attname) yang memengaruhi counter seat di Redis
+INVENTORY_FIELDS = {
+    Ticket: ('quota', 'event_id_id'),
+    Event: ('quota',),
+}
+
+
+def _saved_fields(sender, update_fields):
+    fields = INVENTORY_FIELDS[sender]
+    if update_fields is None:
+        return fields
+    written = {sender._meta.get_field(name).attname for name in update_fields}
+    return [field for field in fields if field in written]
+
+
+def _changes(sender, instance, created, update_fields):
+    """
+    {attname: (old, new)} of the inventory fields this save changed, and
+    remember the new values for the next save.
+    """
+    if created:
+        return {}
+    loaded = instance.__dict__.setdefault('_loaded_values', {})
+    changes = {}
+    for field in _saved_fields(sender, update_fields):
+        value = getattr(instance, field)
+        if field in loaded and loaded[field] != value:
+            changes[field] = (loaded[field], value)
+        loaded[field] = value
+    return changes
+
+
+@receiver([post_save, post_delete], sender=Ticket, dispatch_uid='tickets_bump_generation')
+def bump_ticket_generation(sender, **kwargs):
+    bump_generation('tickets')
+
+
+@receiver(pre_save, sender=Ticket, dispatch_uid='tickets_load_inventory_fields')
+@receiver(pre_save, sender=Event, dispatch_uid='events_load_inventory_fields')
+def load_inventory_fields(sender, instance, raw, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    loaded = instance.__dict__.setdefault('_loaded_values', {})
+    missing = [field for field in _saved_fields(sender, update_fields) if field not in loaded]
+    if missing:
+        # instance tidak di-load dari database atau field-nya di-defer: ambil nilai lamanya
+        loaded.update(sender.objects.filter(pk=instance.pk).values(*missing).first() or {})
+
+
+# counter di Redis hanya disesuaikan dengan selisihnya, tidak pernah di-drop
+# lalu di-load ulang: seat yang sedang di-reserve belum ada di database
+@receiver(post_save, sender=Ticket, dispatch_uid='tickets_update_inventory')
+def update_ticket_inventory(sender, instance, created, update_fields=None, **kwargs):
+    changes = _changes(sender, instance, created, update_fields)
+    ticket_id = instance.pk
+    if 'quota' in changes:
+        old_quota, quota = changes['quota']
+        transaction.on_commit(lambda: change_ticket_quota(ticket_id, quota - old_quota))
+    if 'event_id_id' in changes:
+        (old_event_id, event_id), seats = changes['event_id_id'], held_seats(ticket_id)
+        transaction.on_commit(lambda: move_ticket(ticket_id, old_event_id, event_id, seats))
+
+
+@receiver(pre_delete, sender=Ticket, dispatch_uid='tickets_count_held_seats')
+def count_held_seats(sender, instance, origin=None, **kwargs):
+    # event ikut dihapus: counter event di-drop, seat-nya tidak perlu dihitung
+    if not deleted_with(origin, Event):
+        instance._held_seats = held_seats(instance.pk)
+
+
+@receiver(post_delete, sender=Ticket, dispatch_uid='tickets_drop_inventory')
+def drop_ticket_inventory(sender, instance, **kwargs):
+    ticket_id, event_id, seats = instance.pk, instance.event_id_id, getattr(instance, '_held_seats', 0)
+    transaction.on_commit(lambda: drop_ticket(ticket_id, event_id, seats))
+
+
+@receiver(post_save, sender=Ticket, dispatch_uid='tickets_create_sales')
+def create_ticket_sales(sender, instance, created, **kwargs):
+    if created:
+        TicketSales.objects.create(ticket_id=instance)
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events_update_inventory')
+def update_event_inventory(sender, instance, created, update_fields=None, **kwargs):
+    changes = _changes(sender, instance, created, update_fields)
+    if 'quota' in changes:
+        (old_quota, quota), event_id = changes['quota'], instance.pk
+        transaction.on_commit(lambda: change_event_quota(event_id, quota - old_quota))
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='events_drop_inventory')
+def drop_event_inventory(sender, instance, **kwargs):
+    event_id = instance.pk
+    transaction.on_commit(lambda: drop_event(event_id))
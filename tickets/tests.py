@@ -1,3 +1,98 @@
+from datetime import timedelta
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import User
+from core.redis_client import get_redis
+from events.models import Event
+from payments.models import Registration
+from .inventory import KEY_EVENT, KEY_TICKET, SoldOut, reserve
+from .models import Ticket
 
-# Create your tests here.
+
+class TicketListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_tickets(self, count):
+        now = timezone.now()
+        for i in range(count):
+            # setiap ticket di event sendiri, supaya join ke event benar-benar diuji
+            event = Event.objects.create(
+                name=f'Event {i}', description='Description', location='Jakarta',
+                start_time=now, end_time=now + timedelta(hours=2), status='open', quota=100
+            )
+            Ticket.objects.create(
+                event_id=event, name='Regular', price=100000,
+                sales_start=now, sales_end=now + timedelta(days=1), quota=100
+            )
+
+    def test_ticket_list_query_count_is_constant(self):
+        self.create_tickets(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/tickets/?page_size=100')
+
+        self.create_tickets(10)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get('/api/tickets/?page_size=100')
+        self.assertEqual(len(response.json()['tickets']), 11)
+
+
+class InventoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+        now = timezone.now()
+        cls.event = Event.objects.create(
+            name='Event', description='Description', location='Jakarta',
+            start_time=now, end_time=now + timedelta(hours=2), status='open', quota=10
+        )
+        cls.ticket = Ticket.objects.create(
+            event_id=cls.event, name='Regular', price=100000,
+            sales_start=now - timedelta(days=1), sales_end=now + timedelta(days=1), quota=2
+        )
+
+    def setUp(self):
+        get_redis().delete(KEY_TICKET.format(self.ticket.pk), KEY_EVENT.format(self.event.pk))
+
+    def update(self, model, pk, **values):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance = model.objects.get(pk=pk)
+            for field, value in values.items():
+                setattr(instance, field, value)
+            instance.save()
+
+    def reserve_all(self):
+        reserved = 0
+        while True:
+            try:
+                reserve(self.ticket)
+            except SoldOut:
+                return reserved
+            reserved += 1
+
+    def test_edit_during_sale_keeps_uncommitted_reservations(self):
+        # seat sudah di-reserve di Redis, registration-nya belum di-commit
+        reserve(self.ticket)
+        self.update(Ticket, self.ticket.pk, name='Early Bird')
+        self.update(Event, self.event.pk, description='Updated')
+        self.assertEqual(self.reserve_all(), 1)
+
+        Registration.objects.create(ticket_id=self.ticket, user_id=self.user)
+        self.assertEqual(self.reserve_all(), 0)
+
+    def test_quota_change_adjusts_remaining_seats(self):
+        reserve(self.ticket)
+        self.update(Ticket, self.ticket.pk, quota=5)
+        self.assertEqual(self.reserve_all(), 4)
+
+        self.update(Ticket, self.ticket.pk, quota=8)
+        self.update(Event, self.event.pk, quota=6)
+        self.assertEqual(self.reserve_all(), 1)
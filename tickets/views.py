@@ -3,18 +3,28 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from .models import Ticket
+from .filters import filter_tickets
 from .serializers import TicketSerializer
 from core.permissions import IsAdminOrSuperUser
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.core.cache import cache
-import json
+from core.links import cache_variant
+from core.pagination import KeysetPagination
+from core.cache import make_key, render_entry, entry_response
 from dico_event.logging_config import logger
 
 CACHE_KEY_TICKET_DETAIL = "ticket_detail_{}"
 
+
+class TicketPagination(KeysetPagination):
+    ordering = ('sales_start', 'id')
+
+
 class TicketListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+    # semua kolom yang dibaca TicketSerializer, event di-join dalam query yang sama
+    queryset = Ticket.objects.select_related('event_id').only(
+        'id', 'event_id', 'name', 'price', 'sales_start', 'sales_end', 'quota', 'event_id__name'
+    )
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -24,10 +34,12 @@ class TicketListCreateView(APIView):
         return [IsAuthenticated()]
     
     def get(self, request):
-        tickets = Ticket.objects.all()
-        serializer = TicketSerializer(tickets, many=True, context={'request': request})
-        logger.info(f"{len(tickets)} tickets retrieved by {request.user}")
-        return Response({'tickets': serializer.data})
+        tickets = filter_tickets(self.queryset.all(), request.query_params)
+        paginator = TicketPagination()
+        page = paginator.paginate_queryset(tickets, request, view=self)
+        serializer = TicketSerializer(page, many=True, context={'request': request})
+        logger.info(f"{len(page)} tickets retrieved by {request.user}")
+        return Response({'tickets': serializer.data, **paginator.get_links()})
 
     def post(self, request):
         serializer = TicketSerializer(data=request.data, context={'request': request})
@@ -40,8 +52,6 @@ class TicketListCreateView(APIView):
 
 
 class TicketDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
-
     def get_permissions(self):
         if self.request.method == 'GET':
             return [IsAuthenticated()]
@@ -53,34 +63,27 @@ class TicketDetailView(APIView):
         return get_object_or_404(Ticket, pk=pk)
 
     def get(self, request, pk):
-        cache_key = CACHE_KEY_TICKET_DETAIL.format(pk)
+        cache_key = make_key('tickets', CACHE_KEY_TICKET_DETAIL.format(pk) + cache_variant(request))
         ticket_data = cache.get(cache_key)
 
         if not ticket_data:
             logger.info(f"Ticket {pk} retrieved from database by {request.user}")
             ticket = self.get_object(pk)
             serializer = TicketSerializer(ticket, context={'request': request})
-            ticket_data = json.dumps(serializer.data, default=str)
+            ticket_data = render_entry(serializer.data)
             cache.set(cache_key, ticket_data, timeout=3600)
             data_source = 'database'
         else:
             logger.info(f"Ticket {pk} retrieved from cache by {request.user}")
             data_source = 'cache'
 
-        response = Response(json.loads(ticket_data))
-        response['X-Data-Source'] = data_source
-        return response
+        return entry_response(request, ticket_data, data_source)
 
     def put(self, request, pk):
         ticket = self.get_object(pk)
         serializer = TicketSerializer(ticket, data=request.data, context={'request': request}, partial=True)
         if serializer.is_valid():
             ticket = serializer.save()
-            cache.set(
-                CACHE_KEY_TICKET_DETAIL.format(pk),
-                json.dumps(serializer.data, default=str),
-                timeout=3600
-            )
             logger.info(f"Ticket {ticket.id} updated by {request.user}")
             return Response(serializer.data)
         logger.error(f"Ticket {pk} update failed by {request.user} - {serializer.errors}")
@@ -89,6 +92,5 @@ class TicketDetailView(APIView):
     def delete(self, request, pk):
         ticket = self.get_object(pk)
         ticket.delete()
-        cache.delete(CACHE_KEY_TICKET_DETAIL.format(pk))
         logger.info(f"Ticket {pk} deleted by {request.user}")
         return Response(status=status.HTTP_204_NO_CONTENT)